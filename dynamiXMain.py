@@ -6,11 +6,27 @@ import time
 import threading
 import random
 import json
+import copy
+import functools
+import queue
+import re
+import atexit
+import tempfile
 import traceback
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import requests
+from requests.adapters import HTTPAdapter
 from update import is_update_available
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib json module is used without it
+    orjson = None
+
 # ——————————— Absolute paths & Logging Setup ———————————
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 library_lock = threading.Lock()
@@ -22,22 +38,80 @@ USER_EXEMPTIONS_FILE  = os.path.join(BASE_DIR, 'user_exemptions.json')
 RUN_STATE_FILE        = os.path.join(BASE_DIR, 'run_state.json')
 CURRENT_ROLL_FILE     = 'current_roll.txt'
 
+# Parsed JSON files keyed by path -> ((st_mtime_ns, st_size), data)
+_JSON_CACHE = {}
+
+# One lock per file written by _write_file_atomic(), so concurrent saves of the
+# same file (main loop, web routes, run-once thread) can't interleave
+_WRITE_LOCKS = {}
+_WRITE_LOCKS_GUARD = threading.Lock()
+
+# Sanitized config as returned by load_config(), keyed by path -> ((st_mtime_ns, st_size), config)
+_PREPARED_CONFIG = {}
+
+# Pin state apply_pinning() last confirmed or set, one entry per target, keyed by
+# (collection ratingKey, target) -> (time.monotonic(), promoted)
+_CONFIRMED_VISIBILITY = {}
+
+# Active pre-roll names read from current_roll.txt, keyed by path -> ((st_mtime_ns, st_size), name)
+_CURRENT_ROLL_CACHE = {}
+
+# Shared keep-alive session for Plex, created on first use by get_plex_session()
+_PLEX_SESSION = None
+_PLEX_SESSION_LOCK = threading.Lock()
+
+# Most recent PlexServer client, keyed by (plex_url, plex_token) -> (time.monotonic(), client)
+_PLEX_CLIENT = {}
+_PLEX_CLIENT_LOCK = threading.Lock()
+
+# Day names as stored in time_blocks[*]["days"], indexed by date.weekday()
+WEEKDAY_ABBREVS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+WEEKDAY_INDEX = {abbrev: i for i, abbrev in enumerate(WEEKDAY_ABBREVS)}
+
+# Upper bound on libraries processed concurrently against Plex
+MAX_LIBRARY_WORKERS = 8
+
+# Number of trailing log lines shown on the logs page
+LOG_VIEW_LINES = 500
+# Largest ?limit= accepted by /logs_data
+LOG_DATA_MAX_LINES = 2000
+# Lines hidden from the "base" log view (debug output and HTTP request noise)
+_NOISY_LOG_LINE = re.compile(r"DEBUG|HTTP/").search
+
+# Settings form fields: integer inputs with their defaults, and checkboxes as
+# (form field, config key) pairs
+SETTINGS_INT_FIELDS = (("pinning_interval", 30), ("exclusion_days", 3), ("minimum_items", 1))
+SETTINGS_CHECKBOXES = (
+    ("always_pin", "always_pin_new_episodes"),
+    ("auth_enabled", "auth_enabled"),
+    ("separate_pinning", "separate_pinning"),
+)
+PINNING_TARGET_CHECKBOXES = (("pt_library", "library_recommended"), ("pt_home", "home"), ("pt_shared", "shared_home"))
+
+# 'MM-DD' with an optional 'YYYY-' prefix, as used by seasonal and pre-roll blocks
+MONTH_DAY_RE = re.compile(r"^(?:\d{4}-)?(0?[1-9]|1[0-2])-(0?[1-9]|[12]\d|3[01])$")
+
 # Create logs directory if missing
 os.makedirs(LOG_DIR, exist_ok=True)
 
-for h in logging.root.handlers[:]:
-    logging.root.removeHandler(h)
-
-# Configure root logger
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
+# Configure the root logger once per process (update.py's basicConfig is replaced).
+# Callers only enqueue records; a listener thread does the file and console I/O,
+# so library workers never wait on the disk while logging.
+if not any(isinstance(h, QueueHandler) for h in logging.root.handlers):
+    _log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(
+        _log_queue,
         logging.FileHandler(LOG_FILE, mode='a', encoding='utf-8'),
         logging.StreamHandler(sys.stdout)
-    ],
-    force=True
-)
+    )
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(_log_queue)],
+        force=True
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 
 # ----------------------- Default Seasonal Blocks -----------------------
 import calendar
@@ -162,6 +236,15 @@ HOLIDAY_KEYWORDS = {
     ],
 }
 
+# One case-insensitive alternation per holiday, longest keyword first
+HOLIDAY_PATTERNS = {
+    name: re.compile(
+        "|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)),
+        re.IGNORECASE
+    )
+    for name, keywords in HOLIDAY_KEYWORDS.items()
+}
+
 KOMETA_DEFAULT_TYPES = {
     # Awards & Separators
     "separator_award": ["movie", "show"],
@@ -236,7 +319,7 @@ KOMETA_DEFAULT_TYPES = {
     "decade":          ["movie", "show"],
 }
 
-SHARED_TEMPLATE_VARS = [
+SHARED_TEMPLATE_VARS = (
     # Sync modes
     "sync_mode", "sync_mode_<key>",
     # Visibility & ordering
@@ -279,7 +362,7 @@ SHARED_TEMPLATE_VARS = [
     "visible_home",           "visible_home_<key>",
     "visible_library",        "visible_library_<key>",
     "visible_shared",         "visible_shared_<key>",
-]
+)
 
 # 2. Any defaults that expose additional, file-specific knobs:
 FILE_SPECIFIC_VARS = {
@@ -290,11 +373,20 @@ FILE_SPECIFIC_VARS = {
     # …if you discover any others on their individual pages, add them here…
 }
 
+# Read-only tuples: defaults without extra knobs all share SHARED_TEMPLATE_VARS itself
 KOMETA_DEFAULT_VARS = {
-    key: SHARED_TEMPLATE_VARS + FILE_SPECIFIC_VARS.get(key, [])
+    key: SHARED_TEMPLATE_VARS + tuple(FILE_SPECIFIC_VARS[key]) if key in FILE_SPECIFIC_VARS
+         else SHARED_TEMPLATE_VARS
     for key in KOMETA_DEFAULT_TYPES
 }
 
+# Inverted KOMETA_DEFAULT_TYPES: section type ("movie"/"show") -> defaults offered for it
+KOMETA_DEFAULTS_BY_TYPE = {}
+for _key, _types in KOMETA_DEFAULT_TYPES.items():
+    for _type in _types:
+        KOMETA_DEFAULTS_BY_TYPE.setdefault(_type, []).append(_key)
+del _key, _types, _type
+
 # Stores the current active pre-roll block name
 CURRENT_ROLL_FILE = 'current_roll.txt'
 
@@ -303,115 +395,222 @@ CURRENT_ROLL_FILE = 'current_roll.txt'
 def process_library(plex, library_name, config, used_collections,
                     user_exemptions, pinning_targets, always_pin_new_episodes,
                     seasonal_blocks, pinned_collections, exclusion_days,
-                    all_recently_pinned):
+                    all_recently_pinned, library_collections=None, now=None):
     """
     Do everything you were doing in the per-library loop:
     - build a list of titles that actually exist in this library
     - unpin old items (except “New Episodes” when enabled)
     - pin new ones
     - update exclusions
-    - collect titles into all_recently_pinned
+    - collect "Title (Library)" labels into the all_recently_pinned set
+
+    `library_collections` is the (section, collections) pair from
+    fetch_library_collections(); when omitted it is fetched here.
+    `now` is the cycle's timestamp, shared by every library in the cycle.
+    `seasonal_blocks` may already be narrowed to the cycle's active_seasonal_blocks().
     """
+    if now is None:
+        now = datetime.now()
     actual_pins = []
 
     try:
-        # Fetch this library’s section once up-front
-        lib_section = plex.library.section(library_name)
-        available_titles = {c.title for c in lib_section.collections()}
+        # Fetch this library’s section and collections once up-front
+        if library_collections is None:
+            lib_section = get_library_section(plex, library_name)
+            colls = lib_section.collections()
+        else:
+            lib_section, colls = library_collections
+        # One pass over the listing; the first collection wins if titles repeat
+        by_title = {}
+        for c in colls:
+            by_title.setdefault(c.title, c)
+
+        candidates = []
 
         # (A) “New Episodes” if present
-        if always_pin_new_episodes and "New Episodes" in available_titles:
-            actual_pins.append("New Episodes")
+        if always_pin_new_episodes:
+            candidates.append("New Episodes")
 
         # (B) Always-pinned collections
-        for pc in pinned_collections:
-            title = pc.get("title", "")
-            if library_name in pc.get("libraries", []) and title in available_titles:
-                actual_pins.append(title)
+        candidates.extend(
+            pc.get("title", "") for pc in pinned_collections
+            if library_name in pc.get("libraries", [])
+        )
 
         # (C) Seasonal blocks
-        for b in pin_seasonal_blocks_for_library(library_name, seasonal_blocks):
-            title = b["title"]
-            if title in available_titles:
-                actual_pins.append(title)
+        candidates.extend(
+            b["title"] for b in pin_seasonal_blocks_for_library(library_name, seasonal_blocks, now.date())
+        )
 
         # (D) Time-block/random picks
         time_picks = gather_time_block_items_for_library(
-            plex, library_name, config, used_collections, user_exemptions
+            plex, library_name, config, used_collections, user_exemptions,
+            all_collections=colls, now=now
         )
-        for item in time_picks:
-            title = item["title"]
-            if title in available_titles:
-                actual_pins.append(title)
-
-        # — Unpin everything (except “New Episodes” when needed) —
-        for coll in lib_section.collections():
-            if not (always_pin_new_episodes and coll.title == "New Episodes"):
-                apply_pinning(coll, pinning_targets, action="demote")
+        candidates.extend(item["title"] for item in time_picks)
+
+        # Keep titles that exist in this library, once each, in priority order
+        actual_pins = [title for title in dict.fromkeys(candidates) if title in by_title]
+
+        # — Unpin everything else (except “New Episodes” when needed) —
+        # Collections that are about to be pinned again are left alone, and
+        # states confirmed within pin_recheck_seconds aren't fetched again.
+        recheck = pin_recheck_seconds(config)
+        keep = {id(by_title[title]) for title in actual_pins}
+        skip_demote = {"New Episodes"} if always_pin_new_episodes else frozenset()
+        for coll in colls:
+            if id(coll) in keep or coll.title in skip_demote:
+                continue
+            apply_pinning(coll, pinning_targets, action="demote", recheck_seconds=recheck)
 
         # — Pin each verified title —
         for title in actual_pins:
-            coll = next((c for c in lib_section.collections() if c.title == title), None)
+            coll = by_title.get(title)
             if coll:
-                apply_pinning(coll, pinning_targets, action="promote")
+                apply_pinning(coll, pinning_targets, action="promote", recheck_seconds=recheck)
 
     except Exception as e:
         logging.error(f"Error in thread for '{library_name}': {e}")
 
     # — Update exclusion list & shared run-state with only the pins we actually did —
     with library_lock:
-        log_and_update_exclusion_list(actual_pins, used_collections, exclusion_days)
-        all_recently_pinned.extend(f"{t} ({library_name})" for t in actual_pins)
+        log_and_update_exclusion_list(actual_pins, used_collections, exclusion_days, now.date())
+        all_recently_pinned.update(f"{t} ({library_name})" for t in actual_pins)
 
 
+@functools.lru_cache(maxsize=16)
 def compute_easter(year):
-    # Anonymous Gregorian algorithm
-    a = year % 19
-    b = year // 100; c = year % 100
-    d = (19*a + b - b//4 - ((b - (b+8)//25 +1)//3) +15) % 30
-    e = (32 + 2*(b%4) + 2*(c//4) - d - (c%4)) % 7
-    f = d + e - 7*((a + 11*d + 22*e)//451) + 114
-    month = f//31
-    day   = (f % 31) + 1
-    return date(year, month, day)
-
+    # Oudin's Gregorian algorithm: Easter as an offset from March 28
+    g = year % 19
+    c = year // 100
+    h = (c - c//4 - (8*c + 13)//25 + 19*g + 15) % 30
+    i = h - (h//28) * (1 - (h//28) * (29//(h + 1)) * ((21 - g)//11))
+    j = (year + year//4 + i + 2 - c + c//4) % 7
+    return date(year, 3, 28) + timedelta(days=i - j)
+
+@functools.lru_cache(maxsize=256)
 def find_nth_weekday(year, month, weekday, nth):
     # weekday: Mon=0…Sun=6; nth: 1=first, 2=second, … -1=last
-    cal = calendar.monthcalendar(year, month)
+    first_dow, last_day = calendar.monthrange(year, month)
+    first = 1 + (weekday - first_dow) % 7
     if nth > 0:
-        week = cal[nth-1]
-        if week[weekday] == 0:
-            week = cal[nth]  # fallback
-        return date(year, month, week[weekday])
-    else:
-        for week in reversed(cal):
-            if week[weekday]:
-                return date(year, month, week[weekday])
+        return date(year, month, first + 7 * (nth - 1))
+    return date(year, month, last_day - (last_day - first) % 7)
 
-def apply_pinning(collection, pinning_targets, action="promote"):
+@functools.lru_cache(maxsize=4)
+def holiday_date_ranges(year):
+    """
+    Resolve DEFAULT_SEASONAL_BLOCKS to concrete dates for `year`.
+    Returns a tuple of (name, start_date, end_date); computed once per year.
+    """
+    ranges = []
+    for d in DEFAULT_SEASONAL_BLOCKS:
+        if d["type"] == HolidayType.STATIC:
+            m1, day1 = map(int, d["start"].split("-"))
+            m2, day2 = map(int, d["end"].split("-"))
+            sd = date(year, m1, day1)
+            ed = date(year, m2, day2)
+        elif d["type"] == HolidayType.EASTER:
+            eas = compute_easter(year)
+            sd = eas + timedelta(days=d.get("offset_start", 0))
+            ed = eas + timedelta(days=d.get("offset_end", 0))
+        else:  # NTH_WEEKDAY
+            sd = find_nth_weekday(year, d["month"], d["weekday"], d["nth"])
+            ed = sd + timedelta(days=d["duration_days"] - 1)
+        ranges.append((d["name"], sd, ed))
+    return tuple(ranges)
+
+@functools.lru_cache(maxsize=4)
+def quick_add_defaults(year):
+    """
+    Holiday windows for the Quick-Add forms as month-day strings,
+    with single-day holidays widened to ±3 days.
+    Cached per year; the returned tuple is shared, so treat it as read-only.
+    """
+    quick = []
+    for name, sd, ed in holiday_date_ranges(year):
+        if sd == ed:
+            sd -= timedelta(days=3)
+            ed += timedelta(days=3)
+        quick.append({
+            "name":    name,
+            "start_md": f"{sd.month:02d}-{sd.day:02d}",
+            "end_md":   f"{ed.month:02d}-{ed.day:02d}"
+        })
+    return tuple(quick)
+
+@functools.lru_cache(maxsize=4)
+def seasonal_defaults(year):
+    """
+    Return (default_blocks, weekly_defaults) for the Settings page: every default
+    holiday as full YYYY-MM-DD dates, and the subset whose name ends in "week".
+    Cached per year; the returned tuples are shared, so treat them as read-only.
+    """
+    computed_defaults = tuple(
+        {
+            "name": name,
+            "start_date": sd.isoformat(),
+            "end_date": ed.isoformat()
+        }
+        for name, sd, ed in holiday_date_ranges(year)
+    )
+    weekly_defaults = tuple(
+        b for b in computed_defaults
+        if b["name"].lower().endswith("week")
+    )
+    return computed_defaults, weekly_defaults
+
+def collection_size(collection):
+    """
+    Number of items in a collection. Uses the childCount Plex already sent with the
+    collection listing and only fetches the items when that attribute is missing.
+    """
+    count = getattr(collection, "childCount", None)
+    if count is None:
+        return len(collection.items())
+    return count
+
+def apply_pinning(collection, pinning_targets, action="promote", recheck_seconds=0):
     """
     Apply pinning or unpinning based on user-selected targets.
     :param collection: The Plex collection object.
     :param pinning_targets: A dictionary indicating the selected pinning targets.
     :param action: Either 'promote' or 'demote'.
+    :param recheck_seconds: Trust a state this process confirmed less than this many
+        seconds ago instead of fetching the collection's visibility again (0 = always fetch).
+
+    Targets already in the wanted state are skipped, and the remaining ones are
+    sent to Plex as a single visibility update.
     """
+    if action not in ("promote", "demote"):
+        return
+    wanted = action == "promote"
+    rating_key = getattr(collection, "ratingKey", None)
+    targets = [t for t in ("library_recommended", "home", "shared_home") if pinning_targets.get(t, False)]
+    if recheck_seconds > 0 and rating_key is not None:
+        now = time.monotonic()
+        confirmed = [_CONFIRMED_VISIBILITY.get((rating_key, t)) for t in targets]
+        if all(c and c[1] == wanted and now - c[0] < recheck_seconds for c in confirmed):
+            return
     try:
         hub = collection.visibility()
-        if action == "promote":
-            if pinning_targets.get("library_recommended", False):
-                hub.promoteRecommended()
-            if pinning_targets.get("home", False):
-                hub.promoteHome()
-            if pinning_targets.get("shared_home", False):
-                hub.promoteShared()
-        elif action == "demote":
-            if pinning_targets.get("library_recommended", False):
-                hub.demoteRecommended()
-            if pinning_targets.get("home", False):
-                hub.demoteHome()
-            if pinning_targets.get("shared_home", False):
-                hub.demoteShared()
+        changes = {}
+        if pinning_targets.get("library_recommended", False) and hub.promotedToRecommended != wanted:
+            changes["recommended"] = wanted
+        if pinning_targets.get("home", False) and hub.promotedToOwnHome != wanted:
+            changes["home"] = wanted
+        if pinning_targets.get("shared_home", False) and hub.promotedToSharedHome != wanted:
+            changes["shared"] = wanted
+        if changes:
+            hub.updateVisibility(**changes)
+        # Recorded per target, so a demote of all targets (e.g. /clear_pins) also
+        # replaces what a single-target phase confirmed earlier
+        now = time.monotonic()
+        for t in targets:
+            _CONFIRMED_VISIBILITY[(rating_key, t)] = (now, wanted)
     except Exception as e:
+        for t in ("library_recommended", "home", "shared_home"):
+            _CONFIRMED_VISIBILITY.pop((rating_key, t), None)
         logging.error(f"Error during {action} for collection '{collection.title}': {e}")
 
 def sanitize_time_blocks(time_blocks):
@@ -436,21 +635,275 @@ def sanitize_time_blocks(time_blocks):
         sanitized.append(block)
     return sanitized
 
+def _time_to_minutes(value):
+    """
+    Convert an 'HH:MM' string into minutes since midnight ('24:00' marks end of day).
+    Raises ValueError for anything else.
+    """
+    hours, sep, minutes = value.strip().partition(":")
+    if not (sep and 1 <= len(hours) <= 2 and len(minutes) == 2
+            and hours.isdigit() and minutes.isdigit()):
+        raise ValueError(f"expected HH:MM, got {value!r}")
+    total = int(hours) * 60 + int(minutes)
+    if int(minutes) > 59 or total > 24 * 60:
+        raise ValueError(f"expected HH:MM, got {value!r}")
+    return total
+
+def compile_time_blocks(time_blocks):
+    """
+    Index time blocks by library and weekday for get_current_time_block().
+    Returns {library: [7 x (starts, entries, overlapping) or None]}, indexed by
+    date.weekday(); day names are only looked at here. `entries` are
+    (start_min, end_min, order, name, limit) tuples sorted by start, `starts` holds
+    their start minutes for bisecting, and `overlapping` flags days whose blocks
+    overlap (those keep the first-block-in-config-order rule).
+    """
+    index = {}
+    for order, block in enumerate(time_blocks):
+        try:
+            start = _time_to_minutes(block["start_time"])
+            end = _time_to_minutes(block["end_time"])
+        except (KeyError, ValueError, AttributeError):
+            logging.warning(f"Invalid start/end time in time block '{block.get('name', 'Unnamed')}'. Skipping.")
+            continue
+        entry = (start, end, order, block.get("name", "Default"), block.get("limit"))
+        weekdays = [WEEKDAY_INDEX[day] for day in block.get("days", []) if day in WEEKDAY_INDEX]
+        for library_name in block.get("libraries", []):
+            for weekday in weekdays:
+                index.setdefault(library_name, {}).setdefault(weekday, []).append(entry)
+
+    compiled = {}
+    for library_name, days in index.items():
+        compiled[library_name] = [None] * 7
+        for weekday, entries in days.items():
+            entries.sort()
+            overlapping = False
+            latest_end = None
+            for start, end, *_ in entries:
+                if latest_end is not None and start < latest_end:
+                    overlapping = True
+                    break
+                latest_end = end if latest_end is None else max(latest_end, end)
+            compiled[library_name][weekday] = ([e[0] for e in entries], entries, overlapping)
+    return compiled
+
+def _parse_month_day(value):
+    """
+    Parse 'YYYY-MM-DD' or 'MM-DD' into a (month, day) tuple.
+    Raises ValueError for anything else.
+    """
+    match = MONTH_DAY_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"expected MM-DD or YYYY-MM-DD, got {value!r}")
+    return int(match.group(1)), int(match.group(2))
+
+def _seasonal_window(block):
+    """
+    Return (start_md, end_md, wraps) for a seasonal block, using the values
+    cached by compile_seasonal_blocks() when present.
+    """
+    if "_start" in block:
+        return block["_start"], block["_end"], block["_wraps"]
+    start_md = _parse_month_day(block["start_date"])
+    end_md = _parse_month_day(block["end_date"])
+    return start_md, end_md, start_md > end_md
+
+def compile_seasonal_blocks(seasonal_blocks):
+    """
+    Cache each block's parsed (month, day) start/end and whether it wraps the year
+    as '_start', '_end' and '_wraps'. Used for seasonal and pre-roll blocks alike,
+    which share the start_date/end_date format. Blocks that fail to parse are left untouched
+    and reported when they are evaluated.
+    """
+    for block in seasonal_blocks:
+        if not isinstance(block, dict):
+            continue
+        try:
+            start_md, end_md, wraps = _seasonal_window(block)
+        except Exception:
+            continue
+        block["_start"], block["_end"], block["_wraps"] = start_md, end_md, wraps
+
+def _public_config(config):
+    """
+    Copy of `config` without the derived '_'-prefixed keys added by load_config(),
+    both at the top level and on the block dicts inside list settings.
+    """
+    public = {}
+    for key, value in config.items():
+        if key.startswith("_"):
+            continue
+        if isinstance(value, list):
+            value = [
+                {k: v for k, v in item.items() if not k.startswith("_")} if isinstance(item, dict) else item
+                for item in value
+            ]
+        public[key] = value
+    return public
+
+def _append_config_entry(config, key, entry):
+    """
+    Append `entry` to the list setting `key` unless an identical entry (ignoring
+    derived '_'-prefixed keys) is already there. Returns True if it was appended,
+    so add routes can skip save_config() on a repeated submit.
+    """
+    entries = config.setdefault(key, [])
+    for existing in entries:
+        if isinstance(existing, dict) and {k: v for k, v in existing.items() if not k.startswith("_")} == entry:
+            return False
+    entries.append(entry)
+    return True
+
+def _json_loads(data):
+    """
+    Parse JSON from bytes, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj, compact=False):
+    """
+    Serialize `obj` to UTF-8 JSON bytes.
+    Indented output (config.json and other files people edit by hand) always comes
+    from the stdlib with indent=4, so the layout doesn't depend on whether orjson is
+    installed. `compact` output is for files only the app reads and uses orjson
+    when it is available.
+    """
+    if not compact:
+        return json.dumps(obj, indent=4, ensure_ascii=False).encode('utf-8')
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def _file_signature(path):
+    """
+    Return (st_mtime_ns, st_size) for `path`; raises FileNotFoundError if it's missing.
+    The size catches rewrites that land within the filesystem's mtime granularity.
+    """
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def _cached_json_load(path, default):
+    """
+    Return the parsed JSON content of `path`, re-reading the file only when its
+    mtime or size changed since the last load. A missing file yields `default`.
+    Callers get their own copy, so mutating the result never touches the cache.
+    """
+    try:
+        mtime = _file_signature(path)
+    except FileNotFoundError:
+        _JSON_CACHE.pop(path, None)
+        return copy.deepcopy(default)
+
+    cached = _JSON_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            data = _json_loads(f.read())
+        _JSON_CACHE[path] = (mtime, data)
+    else:
+        data = cached[1]
+    return copy.deepcopy(data)
+
+def _write_lock(path):
+    """Return the lock serializing writes to `path`."""
+    with _WRITE_LOCKS_GUARD:
+        return _WRITE_LOCKS.setdefault(os.path.abspath(path), threading.RLock())
+
+def _write_file_atomic(path, payload):
+    """
+    Write the bytes `payload` to `path` via a flushed and fsynced temporary file and
+    os.replace, so a crash leaves either the old or the new file, never a truncated one.
+    Each write gets its own temporary file in the target directory and holds the
+    path's lock, so concurrent saves of the same file never clobber each other.
+    A failed write removes its temporary file before re-raising.
+    """
+    with _write_lock(path):
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp"
+        )
+        try:
+            with open(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file as 0600; keep the permissions the file already had
+            try:
+                os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+def _write_json_atomic(path, data, compact=False):
+    """
+    Write `data` as JSON to `path` via a temporary file and os.replace, so readers
+    never see a half-written file. Skips the write entirely when the file on disk
+    still holds exactly `data`. Returns True if the file was written.
+    """
+    with _write_lock(path):
+        cached = _JSON_CACHE.get(path)
+        if cached is not None and cached[1] == data:
+            try:
+                if _file_signature(path) == cached[0]:
+                    return False
+            except FileNotFoundError:
+                pass
+
+        _write_file_atomic(path, _json_dumps(data, compact))
+        _JSON_CACHE[path] = (_file_signature(path), copy.deepcopy(data))
+        return True
+
 def load_config():
     """
     Load configuration from the CONFIG_FILE.
+    The sanitized config is kept until the file's mtime or size changes, so repeated loads
+    (every web request, every automation cycle) only pay for a copy.
     """
-    if not os.path.exists(CONFIG_FILE):
+    try:
+        mtime = _file_signature(CONFIG_FILE)
+    except FileNotFoundError:
         logging.error(f"Configuration file '{CONFIG_FILE}' not found. Creating a default configuration.")
         return {}
 
+    cached = _PREPARED_CONFIG.get(CONFIG_FILE)
+    if cached is not None and cached[0] == mtime:
+        return copy.deepcopy(cached[1])
+
     try:
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = _cached_json_load(CONFIG_FILE, {})
     except json.JSONDecodeError:
         logging.error(f"Configuration file '{CONFIG_FILE}' is empty or invalid. Resetting to default.")
         return {}
 
+    config = _prepare_config(config)
+    _PREPARED_CONFIG[CONFIG_FILE] = (mtime, copy.deepcopy(config))
+    return config
+
+def load_config_readonly():
+    """
+    Like load_config(), but return the shared cached config without copying it.
+    For hot read-only paths; callers must not modify the result.
+    """
+    try:
+        mtime = _file_signature(CONFIG_FILE)
+    except FileNotFoundError:
+        return {}
+    cached = _PREPARED_CONFIG.get(CONFIG_FILE)
+    if cached is None or cached[0] != mtime:
+        load_config()
+        cached = _PREPARED_CONFIG.get(CONFIG_FILE)
+    return cached[1] if cached is not None else {}
+
+def _prepare_config(config):
+    """
+    Fill in missing or malformed settings and attach the derived block indexes.
+    """
     # Ensure libraries_settings is a dictionary
     libraries_settings = config.get("libraries_settings", {})
     if not isinstance(libraries_settings, dict):
@@ -461,10 +914,12 @@ def load_config():
     # Sanitize time_blocks as a global list
     time_blocks = config.get("time_blocks", [])
     config["time_blocks"] = sanitize_time_blocks(time_blocks)
+    config["_compiled_blocks"] = compile_time_blocks(config["time_blocks"])
 
     # Ensure seasonal_blocks is a list
     if "seasonal_blocks" not in config or not isinstance(config["seasonal_blocks"], list):
         config["seasonal_blocks"] = []
+    compile_seasonal_blocks(config["seasonal_blocks"])
 
     # Ensure pinned_collections is a list
     if "pinned_collections" not in config or not isinstance(config["pinned_collections"], list):
@@ -477,6 +932,7 @@ def load_config():
     # Ensure preroll_blocks is a list
     if "preroll_blocks" not in config or not isinstance(config["preroll_blocks"], list):
         config["preroll_blocks"] = []
+    compile_seasonal_blocks(config["preroll_blocks"])
 
     # Ensure default_preroll_filename is a string
     if "default_preroll_filename" not in config or not isinstance(config["default_preroll_filename"], str):
@@ -495,12 +951,16 @@ def load_config():
 def save_config(config):
     """
     Save the configuration dictionary to CONFIG_FILE.
+    Derived '_'-prefixed keys are not written.
     """
+    config = _public_config(config)
     try:
-        logging.info(f"Final configuration to save: {json.dumps(config, indent=4)}")
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
-        logging.info("Configuration file saved successfully.")
+        # Key names only: the values include plex_token and auth_password
+        logging.debug("Saving configuration keys: %s", ", ".join(sorted(config)))
+        if _write_json_atomic(CONFIG_FILE, config):
+            logging.info("Configuration file saved successfully.")
+        else:
+            logging.info("Configuration unchanged; nothing to save.")
     except Exception as e:
         logging.error(f"Error saving configuration file: {e}")
         raise
@@ -508,11 +968,26 @@ def save_config(config):
 def load_used_collections():
     """
     Load used collections from USED_COLLECTIONS_FILE.
+    Expirations are date ordinals; entries still stored as 'YYYY-MM-DD' strings
+    by older versions are converted and get rewritten on the next save.
+    Entries that have already expired are dropped, so every caller (not just the
+    automation loop) prunes the file on its next save. Malformed expirations are
+    logged and dropped the same way.
     """
-    if not os.path.exists(USED_COLLECTIONS_FILE):
-        return {}
-    with open(USED_COLLECTIONS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    today_ord = datetime.now().date().toordinal()
+    used_collections = {}
+    for title, expires in _cached_json_load(USED_COLLECTIONS_FILE, {}).items():
+        try:
+            if isinstance(expires, str):
+                expires = datetime.strptime(expires, '%Y-%m-%d').date().toordinal()
+            elif not isinstance(expires, int) or isinstance(expires, bool):
+                raise ValueError(f"unexpected value {expires!r}")
+        except ValueError as e:
+            logging.warning(f"Dropping exclusion '{title}' with invalid expiration: {e}")
+            continue
+        if expires > today_ord:
+            used_collections[title] = expires
+    return used_collections
 
 def run_pin_cycle_once():
     config = load_config()
@@ -525,52 +1000,35 @@ def run_pin_cycle_once():
     seasonal_blocks = config.get("seasonal_blocks", [])
     pinned_cols = config.get("pinned_collections", [])
     used = load_used_collections()
-    ex = load_user_exemptions()
-    all_pinned = []
-
-    if not separate:
-        threads = []
-        for lib in libraries:
-            t = threading.Thread(
-                target=process_library,
-                args=(plex, lib, config, used, ex, pinning_targets,
-                      always_pin, seasonal_blocks, pinned_cols,
-                      exclusion_days, all_pinned),
-                daemon=True
-            )
-            t.start(); threads.append(t)
-        for t in threads: t.join()
-    else:
-        # Phase 1: library only
-        lib_targets = { "library_recommended": pinning_targets.get("library_recommended", False),
-                        "home": False, "shared_home": False }
-        threads = []
-        for lib in libraries:
-            t = threading.Thread(
-                target=process_library,
-                args=(plex, lib, config, used, ex, lib_targets,
-                      always_pin, seasonal_blocks, pinned_cols,
-                      exclusion_days, all_pinned),
-                daemon=True
-            )
-            t.start(); threads.append(t)
-        for t in threads: t.join()
-
-        # Phase 2: home/shared only
-        home_targets = { "library_recommended": False,
-                         "home": pinning_targets.get("home", False),
-                         "shared_home": pinning_targets.get("shared_home", False) }
-        threads = []
-        for lib in libraries:
-            t = threading.Thread(
-                target=process_library,
-                args=(plex, lib, config, used, ex, home_targets,
-                      always_pin, seasonal_blocks, pinned_cols,
-                      exclusion_days, all_pinned),
-                daemon=True
-            )
-            t.start(); threads.append(t)
-        for t in threads: t.join()
+    ex = frozenset(load_user_exemptions())
+    all_pinned = set()
+    cycle_now = datetime.now()
+    # Same for every library, so resolve the active seasonal blocks once
+    seasonal_blocks = active_seasonal_blocks(seasonal_blocks, cycle_now.date())
+
+    def run_phase(targets):
+        run_per_library(pool, libraries, lambda lib: process_library(
+            plex, lib, config, used, ex, targets,
+            always_pin, seasonal_blocks, pinned_cols,
+            exclusion_days, all_pinned, lib_map.get(lib), cycle_now
+        ))
+
+    with ThreadPoolExecutor(max_workers=library_worker_count(libraries, config)) as pool:
+        lib_map = fetch_library_collections(plex, libraries, pool)
+        if not separate:
+            run_phase(pinning_targets)
+        else:
+            # Phase 1: library only
+            run_phase({ "library_recommended": pinning_targets.get("library_recommended", False),
+                        "home": False, "shared_home": False })
+
+            # Phase 2: home/shared only
+            run_phase({ "library_recommended": False,
+                        "home": pinning_targets.get("home", False),
+                        "shared_home": pinning_targets.get("shared_home", False) })
+
+    # One exclusion-list write for the whole cycle
+    save_used_collections(used)
 
     # Update run_state
     state = load_run_state()
@@ -579,138 +1037,266 @@ def run_pin_cycle_once():
     state["next_run"]    = (now + timedelta(seconds=config.get("pinning_interval",30)*60))\
                              .strftime("%Y-%m-%d %H:%M:%S")
     state["pinned_today"] = state.get("pinned_today", 0) + len(all_pinned)
-    state["recently_pinned"] = sorted(set(all_pinned))
+    state["recently_pinned"] = sorted(all_pinned)
     save_run_state(state)
-    return all_pinned
+    return state["recently_pinned"]
 
 def save_used_collections(used_collections):
     """
-    Save used collections to USED_COLLECTIONS_FILE.
+    Save used collections to USED_COLLECTIONS_FILE (skipped when nothing changed).
     """
-    with open(USED_COLLECTIONS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(used_collections, f, ensure_ascii=False, indent=4)
-    logging.info("Used collections file saved.")
+    if _write_json_atomic(USED_COLLECTIONS_FILE, used_collections):
+        logging.info("Used collections file saved.")
 
 def load_user_exemptions():
     """
     Load user exemptions from USER_EXEMPTIONS_FILE.
     """
-    if not os.path.exists(USER_EXEMPTIONS_FILE):
-        return []
-    with open(USER_EXEMPTIONS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _cached_json_load(USER_EXEMPTIONS_FILE, [])
 
 def save_user_exemptions(user_exemptions):
     """
-    Save user exemptions to USER_EXEMPTIONS_FILE.
+    Save user exemptions to USER_EXEMPTIONS_FILE (skipped when nothing changed).
     """
-    with open(USER_EXEMPTIONS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(user_exemptions, f, ensure_ascii=False, indent=4)
-    logging.info("User exemptions file saved.")
+    if _write_json_atomic(USER_EXEMPTIONS_FILE, user_exemptions):
+        logging.info("User exemptions file saved.")
 
 def reset_exclusion_list_file():
     """
     Reset the exclusion list by clearing USED_COLLECTIONS_FILE.
     """
-    with open(USED_COLLECTIONS_FILE, 'w', encoding='utf-8') as f:
-        f.write("{}")
+    _write_json_atomic(USED_COLLECTIONS_FILE, {})
     logging.info("Exclusion list file has been reset.")
 
+def get_plex_session():
+    """
+    Return the process-wide requests session used for every Plex connection.
+    Its keep-alive pool is shared by the automation loop, its library workers and
+    the web routes, so repeat connections skip the TCP/TLS handshake.
+    """
+    global _PLEX_SESSION
+    with _PLEX_SESSION_LOCK:
+        if _PLEX_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_LIBRARY_WORKERS, pool_maxsize=4 * MAX_LIBRARY_WORKERS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _PLEX_SESSION = session
+        return _PLEX_SESSION
+
 def connect_to_plex(config):
     """
     Connect to the Plex server using the provided configuration.
+    A connected client is reused for PLEX_CACHE_TTL seconds, so web requests
+    and back-to-back runs skip the connection handshake.
     """
+    key = (config['plex_url'], config['plex_token'])
+    with _PLEX_CLIENT_LOCK:
+        cached = _PLEX_CLIENT.get(key)
+        if cached is not None and time.monotonic() - cached[0] < PLEX_CACHE_TTL:
+            return cached[1]
+
     logging.info("Connecting to Plex server...")
-    plex = PlexServer(config['plex_url'], config['plex_token'])
+    plex = PlexServer(config['plex_url'], config['plex_token'], session=get_plex_session())
+    plex._section_cache = {}
+    with _PLEX_CLIENT_LOCK:
+        _PLEX_CLIENT.clear()
+        _PLEX_CLIENT[key] = (time.monotonic(), plex)
     logging.info("Connected to Plex server successfully.")
     return plex
 
-def handle_new_episodes_pinning(plex, libraries, always_pin_new_episodes, pinning_targets):
+def get_library_section(plex, library_name):
+    """
+    Return the library section for `library_name`, looking it up on Plex only once
+    per connection. Collections are still fetched fresh from the returned section.
+    """
+    cache = getattr(plex, "_section_cache", None)
+    if cache is None:
+        return plex.library.section(library_name)
+    section = cache.get(library_name)
+    if section is None:
+        section = plex.library.section(library_name)
+        cache[library_name] = section
+    return section
+
+def library_worker_count(libraries, config=None):
+    """
+    Number of worker threads to use for per-library Plex work.
+    The optional `plex_concurrency` setting caps how many libraries talk to
+    Plex at once (defaults to MAX_LIBRARY_WORKERS).
+    """
+    limit = MAX_LIBRARY_WORKERS
+    if config:
+        try:
+            limit = int(config.get("plex_concurrency", MAX_LIBRARY_WORKERS))
+        except (TypeError, ValueError):
+            logging.warning("Ignoring invalid plex_concurrency setting.")
+    return max(1, min(limit, len(libraries)))
+
+def pin_recheck_seconds(config):
+    """
+    How long a pin state this process confirmed is trusted before Plex is asked
+    again. Set by the optional `pin_recheck_seconds` setting; 0 (the default)
+    always re-reads.
+    """
+    try:
+        return max(0, int(config.get("pin_recheck_seconds", 0)))
+    except (TypeError, ValueError):
+        logging.warning("Ignoring invalid pin_recheck_seconds setting.")
+        return 0
+
+def run_per_library(pool, libraries, fn, stop_event=None):
     """
-    Handle pinning or unpinning of 'New Episodes' collections based on configuration.
+    Submit fn(library_name) for every library to `pool` and wait for all of them.
+    Stops submitting new work once `stop_event` is set.
     """
-    logging.info("Handling 'New Episodes' collections...")
+    futures = {}
     for library_name in libraries:
+        if stop_event is not None and stop_event.is_set():
+            break
+        futures[pool.submit(fn, library_name)] = library_name
+    for future in as_completed(futures):
         try:
-            library = plex.library.section(library_name)
-            for collection in library.collections():
-                if collection.title.lower() == "new episodes":
-                    if always_pin_new_episodes:
-                        apply_pinning(collection, pinning_targets, action="promote")
-                        logging.info(f"'New Episodes' collection pinned in '{library_name}'.")
-                    else:
-                        apply_pinning(collection, pinning_targets, action="demote")
-                        logging.info(f"'New Episodes' collection unpinned in '{library_name}'.")
-                    break
+            future.result()
         except Exception as e:
-            logging.error(f"Error accessing library '{library_name}': {e}")
+            logging.error(f"Error in thread for '{futures[future]}': {e}")
 
-def unpin_collections(plex, libraries, always_pin_new_episodes, pinning_targets):
+def fetch_library_collections(plex, libraries, pool=None):
     """
-    Unpin all collections except 'New Episodes' if always_pin_new_episodes is True.
+    Fetch each library section and its collections exactly once.
+    Returns {library_name: (section, collections)}; libraries that fail to load are left out.
+    When `pool` is given the libraries are fetched concurrently.
     """
-    logging.info("Unpinning currently pinned collections...")
-    for library_name in libraries:
+    def fetch(library_name):
         try:
-            library = plex.library.section(library_name)
-            for collection in library.collections():
-                # Skip unpinning 'New Episodes' if always_pin_new_episodes is enabled
-                if always_pin_new_episodes and collection.title.lower() == "new episodes":
-                    continue
-                apply_pinning(collection, pinning_targets, action="demote")
-                logging.info(f"Collection '{collection.title}' unpinned in '{library_name}'.")
+            section = get_library_section(plex, library_name)
+            return library_name, (section, section.collections())
         except Exception as e:
             logging.error(f"Error accessing library '{library_name}': {e}")
+            return library_name, None
+
+    results = pool.map(fetch, libraries) if pool else map(fetch, libraries)
+    return {name: entry for name, entry in results if entry is not None}
+
+def unpin_collections(lib_map, always_pin_new_episodes, pinning_targets):
+    """
+    Unpin all collections except 'New Episodes' if always_pin_new_episodes is True.
+    `lib_map` is the result of fetch_library_collections().
+    """
+    logging.info("Unpinning currently pinned collections...")
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    # Skip unpinning 'New Episodes' (any casing) if always_pin_new_episodes is enabled
+    skip_demote = {"new episodes"} if always_pin_new_episodes else frozenset()
+    for library_name, (_, collections) in lib_map.items():
+        unpinned_titles = []
+        for collection in collections:
+            if skip_demote and collection.title.lower() in skip_demote:
+                continue
+            apply_pinning(collection, pinning_targets, action="demote")
+            unpinned_titles.append(collection.title)
+            if debug:
+                logging.debug(f"Collection '{collection.title}' unpinned in '{library_name}'.")
+        logging.info(
+            f"Unpinned {len(unpinned_titles)} collections in '{library_name}': {', '.join(unpinned_titles)}"
+        )
 
-def log_and_update_exclusion_list(pinned_titles, used_collections, exclusion_days):
+def log_and_update_exclusion_list(pinned_titles, used_collections, exclusion_days, today=None):
     """
     Log pinned collection titles and update the exclusion list with their expiration dates.
     Instead of expecting a list of Plex collection objects, we just expect a list of strings.
+    Only the in-memory dict is updated; the caller saves it once all libraries are done.
     """
-    current_date = datetime.now().date()
+    if today is None:
+        today = datetime.now().date()
+    expiration = today.toordinal() + exclusion_days
+    expiration_date = date.fromordinal(expiration).isoformat()
     for title in pinned_titles:
-        expiration_date = (current_date + timedelta(days=exclusion_days)).strftime('%Y-%m-%d')
-        used_collections[title] = expiration_date
-        logging.info(f"Added '{title}' to exclusion list (expires: {expiration_date}).")
-
-    save_used_collections(used_collections)
+        used_collections[title] = expiration
+    if pinned_titles:
+        logging.info(
+            f"Added {len(pinned_titles)} collections to exclusion list "
+            f"(expires: {expiration_date}): {', '.join(pinned_titles)}"
+        )
 
-def get_current_time_block(config, library_name):
+def get_current_time_block(config, library_name, now=None):
     """
     Determine the current time block (and limit) for a given library,
     based on the global time blocks that specify which libraries/days they apply to.
     """
-    now = datetime.now()
-    current_time = now.strftime("%H:%M")
-    today_abbrev = now.strftime("%a")  # e.g. "Mon", "Tue", ...
+    if now is None:
+        now = datetime.now()
+    now_min = now.hour * 60 + now.minute
 
     default_limits = config.get("default_limits", {})
     library_default_limit = default_limits.get(library_name, 5)
 
-    global_time_blocks = config.get("time_blocks", [])
-
-    matching_blocks = []
-    for block in global_time_blocks:
-        if library_name not in block.get("libraries", []):
-            continue
-        if today_abbrev not in block.get("days", []):
-            continue
-        if block.get("start_time") <= current_time < block.get("end_time"):
-            matching_blocks.append(block)
+    compiled = config.get("_compiled_blocks")
+    if compiled is None:
+        compiled = compile_time_blocks(config.get("time_blocks", []))
+
+    library_days = compiled.get(library_name)
+    day_index = library_days[now.weekday()] if library_days else None
+    match = None
+    if day_index:
+        starts, entries, overlapping = day_index
+        if overlapping:
+            # Several blocks may cover now; the first one in config order wins
+            matches = [e for e in entries if e[0] <= now_min < e[1]]
+            match = min(matches, key=lambda e: e[2]) if matches else None
+        else:
+            i = bisect_right(starts, now_min)
+            if i and now_min < entries[i - 1][1]:
+                match = entries[i - 1]
 
-    if matching_blocks:
-        block = matching_blocks[0]
-        return block.get("name", "Default"), block.get("limit", library_default_limit)
+    if match:
+        _, _, _, name, limit = match
+        return name, limit if limit is not None else library_default_limit
     else:
         return "Default", library_default_limit
 
-def pin_seasonal_blocks_for_library(library_name, seasonal_blocks):
+def _seasonal_block_active(block, current_month_day):
+    """
+    True if `block` covers the (month, day) tuple `current_month_day`.
+    Raises ValueError for malformed start/end dates.
+    """
+    # Start/end as (month, day), pre-parsed by load_config() when available
+    start_md, end_md, wraps = _seasonal_window(block)
+
+    # Check if current day is within [start_md, end_md], accounting for wrap-around
+    if not wraps:
+        return start_md <= current_month_day <= end_md
+    # E.g., crosses New Year's (12-30 to 01-05)
+    return current_month_day >= start_md or current_month_day <= end_md
+
+def active_seasonal_blocks(seasonal_blocks, current_date=None):
+    """
+    Return the seasonal blocks that are active on `current_date`.
+    The answer is the same for every library, so a cycle resolves it once and
+    hands the (usually tiny) result to the per-library code.
+    """
+    if current_date is None:
+        current_date = datetime.now().date()
+    current_month_day = (current_date.month, current_date.day)
+
+    active = []
+    for block in seasonal_blocks:
+        try:
+            if _seasonal_block_active(block, current_month_day):
+                active.append(block)
+        except Exception as e:
+            logging.error(
+                f"Invalid seasonal block format for '{block.get('name','Unnamed')}': {e}"
+            )
+    return active
+
+def pin_seasonal_blocks_for_library(library_name, seasonal_blocks, current_date=None):
     """
     Return a list of dictionaries for active seasonal blocks.
     Each dict has { "title": <collection_name> } if the block is active
     and includes 'library_name' in its libraries list.
     """
-    current_date = datetime.now().date()
+    if current_date is None:
+        current_date = datetime.now().date()
     current_month_day = (current_date.month, current_date.day)
 
     pinned_items = []
@@ -719,42 +1305,14 @@ def pin_seasonal_blocks_for_library(library_name, seasonal_blocks):
         if library_name not in block.get("libraries", []):
             continue
 
-        # Parse start/end, supporting YYYY-MM-DD or MM-DD
         try:
-            # Start date
-            sd_parts = block["start_date"].split("-")
-            if len(sd_parts) == 3:
-                _, sm, sd = sd_parts
-            else:
-                sm, sd = sd_parts
-            start_month, start_day = int(sm), int(sd)
-
-            # End date
-            ed_parts = block["end_date"].split("-")
-            if len(ed_parts) == 3:
-                _, em, ed = ed_parts
-            else:
-                em, ed = ed_parts
-            end_month, end_day = int(em), int(ed)
+            is_active = _seasonal_block_active(block, current_month_day)
         except Exception as e:
             logging.error(
                 f"Invalid seasonal block format for '{block.get('name','Unnamed')}': {e}"
             )
             continue
 
-        start_md = (start_month, start_day)
-        end_md   = (end_month, end_day)
-
-        # Check if current day is within [start_md, end_md], accounting for wrap-around
-        if start_md <= end_md:
-            is_active = (start_md <= current_month_day <= end_md)
-        else:
-            # E.g., crosses New Year's (12-30 to 01-05)
-            is_active = (
-                current_month_day >= start_md
-                or current_month_day <= end_md
-            )
-
         if is_active:
             collection_name = block.get("collection", "")
             pinned_items.append({
@@ -763,7 +1321,8 @@ def pin_seasonal_blocks_for_library(library_name, seasonal_blocks):
 
     return pinned_items
 
-def gather_time_block_items_for_library(plex, library_name, config, used_collections, user_exemptions):
+def gather_time_block_items_for_library(plex, library_name, config, used_collections, user_exemptions,
+                                        all_collections=None, now=None):
     """
     Check which time block is active for `library_name`,
     then pick collections that meet the limit, min_items, etc.
@@ -772,27 +1331,28 @@ def gather_time_block_items_for_library(plex, library_name, config, used_collect
     If there aren’t enough valid collections to meet `current_limit`, the dynamic
     exclusion list is reset and the function retries once. If still not enough,
     it returns an empty list.
+
+    Pass `all_collections` when the library's collections were already fetched this cycle.
+    `user_exemptions` is only used for membership tests, so callers should pass a set.
     """
 
-    library = plex.library.section(library_name)
-    all_collections = library.collections()
+    if all_collections is None:
+        all_collections = get_library_section(plex, library_name).collections()
 
-    block_name, current_limit = get_current_time_block(config, library_name)
+    block_name, current_limit = get_current_time_block(config, library_name, now)
     logging.info(f"Time Block for '{library_name}': {block_name}, limit={current_limit}")
 
     min_items = config.get("minimum_items", 1)
 
-    def find_valid_collections(allow_used=True):
-        # If allow_used == True, we exclude anything in used_collections
-        # If allow_used == False, we ignore used_collections
-        return [
-            c for c in all_collections
-            if len(c.items()) >= min_items
-               and c.title not in user_exemptions
-               and (c.title not in used_collections if allow_used else True)
-        ]
-
-    valid = find_valid_collections(allow_used=True)
+    # One pass builds both candidate lists: `all_valid` ignores used_collections,
+    # `valid` additionally excludes anything in it
+    all_valid = []
+    valid = []
+    for c in all_collections:
+        if collection_size(c) >= min_items and c.title not in user_exemptions:
+            all_valid.append(c)
+            if c.title not in used_collections:
+                valid.append(c)
 
     # Not enough the first time? Reset and retry
     if len(valid) < current_limit:
@@ -801,13 +1361,14 @@ def gather_time_block_items_for_library(plex, library_name, config, used_collect
             f"Only {len(valid)} available. RESETTING dynamic exclusion list and RETRYING..."
         )
 
-        # 2) Reset dynamic exclusions
-        reset_exclusion_list_file()
-        used_collections.clear()
-        used_collections.update(load_used_collections())  # Optionally reload if needed
+        # 2) Reset dynamic exclusions (shared with the other library workers)
+        with library_lock:
+            reset_exclusion_list_file()
+            used_collections.clear()
+            used_collections.update(load_used_collections())  # Optionally reload if needed
 
         # 3) Now try again without excluding any used_collections
-        valid = find_valid_collections(allow_used=False)
+        valid = all_valid
 
         if len(valid) < current_limit:
             logging.warning(
@@ -816,26 +1377,26 @@ def gather_time_block_items_for_library(plex, library_name, config, used_collect
             )
             return []
 
-    # 4) We have enough valid collections; pick randomly
-    selected = random.sample(valid, current_limit)
-
-    pinned_items = []
-    for c in selected:
-        pinned_items.append({"title": c.title})
-
-    return pinned_items
+    # 4) We have enough valid collections; pick random positions and only read their titles
+    picks = random.sample(range(len(valid)), current_limit)
+    return [{"title": valid[i].title} for i in picks]
 
 def pin_library_in_order(plex, library_name, pinned_items, pinning_targets, always_pin_new_episodes):
     """
     Remove all pinned items from this library (except 'New Episodes' if always_pin_new_episodes),
     then pin each item in pinned_items. (Pin order logic removed.)
+    Collections that are about to be pinned again are never demoted first.
     """
     logging.info(f"Unpinning items in library '{library_name}' (except 'New Episodes').")
+    desired = {item["title"] for item in pinned_items}
     try:
-        library = plex.library.section(library_name)
-        for collection in library.collections():
+        library = get_library_section(plex, library_name)
+        collections = library.collections()
+        for collection in collections:
             if always_pin_new_episodes and collection.title.lower() == "new episodes":
                 continue
+            if collection.title in desired:
+                continue
             apply_pinning(collection, pinning_targets, action="demote")
             logging.info(f"Collection '{collection.title}' unpinned in '{library_name}'.")
     except Exception as e:
@@ -843,18 +1404,16 @@ def pin_library_in_order(plex, library_name, pinned_items, pinning_targets, alwa
         return
 
     # Now just pin each item in any arbitrary order
+    by_title = {}
+    for c in collections:
+        by_title.setdefault(c.title, c)
     for item in pinned_items:
         title = item["title"]
         try:
-            collection = next(
-                (c for c in library.collections() if c.title == title),
-                None
-            )
+            collection = by_title.get(title)
             if collection:
                 apply_pinning(collection, pinning_targets, action="promote")
                 logging.info(f"Collection '{title}' pinned in '{library_name}'.")
-                # If needed, sleep to give Plex time to reflect changes
-                time.sleep(1)
             else:
                 logging.warning(
                     f"Collection '{title}' not found in '{library_name}'."
@@ -869,6 +1428,8 @@ def pin_defined_collections_global(plex, pinned_collections, pinning_targets):
     """
     logging.info("Pinning always-pinned collections (from 'pinned_collections')...")
 
+    # {library: {title: collection}}, listed the first time a library is needed
+    by_library = {}
     for idx, pinned_item in enumerate(pinned_collections, start=1):
         title = pinned_item.get("title", "Unnamed Collection")
         libs = pinned_item.get("libraries", [])
@@ -876,11 +1437,12 @@ def pin_defined_collections_global(plex, pinned_collections, pinning_targets):
 
         for lib in libs:
             try:
-                library = plex.library.section(lib)
-                collection = next(
-                    (c for c in library.collections() if c.title == title),
-                    None
-                )
+                if lib not in by_library:
+                    by_title = {}
+                    for c in get_library_section(plex, lib).collections():
+                        by_title.setdefault(c.title, c)
+                    by_library[lib] = by_title
+                collection = by_library[lib].get(title)
                 if collection:
                     apply_pinning(collection, pinning_targets, action="promote")
                     logging.info(f"Pinned '{title}' in '{lib}'.")
@@ -896,8 +1458,10 @@ def load_run_state():
     Load the run state (last_run, next_run, pinned_today, recently_pinned, state).
     If the last_run date is before today, reset pinned_today.
     Ensure we always have a 'state' key.
+    The file is only parsed again when it changed (the dashboard polls this).
     """
-    if not os.path.exists(RUN_STATE_FILE):
+    state = _cached_json_load(RUN_STATE_FILE, None)
+    if state is None:
         return {
             "last_run": None,
             "next_run": None,
@@ -906,19 +1470,15 @@ def load_run_state():
             "state": "stopped"
         }
 
-    with open(RUN_STATE_FILE, "r", encoding="utf-8") as f:
-        state = json.load(f)
-
     # Reset daily counters if last_run in a prior day
     last_run_str = state.get("last_run")
     if last_run_str:
         try:
             last_run_date = datetime.strptime(last_run_str, "%Y-%m-%d %H:%M:%S").date()
             today = datetime.now().date()
-            if last_run_date < today:
+            if last_run_date < today and state.get("pinned_today"):
                 state["pinned_today"] = 0
-                with open(RUN_STATE_FILE, "w", encoding="utf-8") as wf:
-                    json.dump(state, wf, indent=4, ensure_ascii=False)
+                _write_json_atomic(RUN_STATE_FILE, state, compact=True)
         except Exception:
             pass
 
@@ -928,12 +1488,65 @@ def load_run_state():
 
 
 def save_run_state(state):
-    with open(RUN_STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=4, ensure_ascii=False)
+    """
+    Save the run state to RUN_STATE_FILE (skipped when nothing changed).
+    Written compactly; only the app reads it.
+    """
+    _write_json_atomic(RUN_STATE_FILE, state, compact=True)
 
 
 # ------------------------------ Pre-Roll Management ------------------------------
 
+@functools.lru_cache(maxsize=4)
+def _scan_preroll_folder(folder, folder_mtime_ns):
+    """
+    One scandir pass over the pre-roll folder. folder_mtime_ns is only part of the
+    cache key: adding, removing or renaming a file bumps it and forces a rescan.
+    """
+    with os.scandir(folder) as entries:
+        return tuple(sorted(
+            e.name for e in entries
+            if e.name != CURRENT_ROLL_FILE
+            and not e.name.startswith("PlexMainPreRoll")
+            and e.is_file()
+        ))
+
+def list_preroll_files(folder):
+    """
+    Return the sorted names of the files in the pre-roll folder that can be picked,
+    leaving out the current_roll.txt marker and the applied PlexMainPreRoll.
+    The listing is reused until the folder's mtime changes; a missing or unset
+    folder yields an empty list.
+    """
+    if not folder:
+        return []
+    try:
+        return list(_scan_preroll_folder(folder, os.stat(folder).st_mtime_ns))
+    except OSError:
+        return []
+
+def read_current_roll(folder):
+    """
+    Return the active pre-roll filename recorded in `folder`'s CURRENT_ROLL_FILE,
+    or "" when there is none. The file is only read again when its mtime or size changed.
+    """
+    path = os.path.join(folder, CURRENT_ROLL_FILE)
+    try:
+        signature = _file_signature(path)
+        cached = _CURRENT_ROLL_CACHE.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        _CURRENT_ROLL_CACHE.pop(path, None)
+        return ""
+    except Exception as e:
+        logging.warning(f"Could not read current_roll file: {e}")
+        return ""
+    _CURRENT_ROLL_CACHE[path] = (signature, name)
+    return name
+
 def manage_prerolls(config):
     """
     Checks if today's date falls into any pre-roll date block.
@@ -951,13 +1564,7 @@ def manage_prerolls(config):
 
     # Load the currently active roll file name from current_roll.txt
     current_roll_path = os.path.join(folder, CURRENT_ROLL_FILE)
-    current_roll_filename = ""
-    if os.path.exists(current_roll_path):
-        try:
-            with open(current_roll_path, 'r', encoding='utf-8') as f:
-                current_roll_filename = f.read().strip()
-        except Exception as e:
-            logging.warning(f"Could not read current_roll file: {e}")
+    current_roll_filename = read_current_roll(folder)
 
     # Determine if there is an active preroll block (the first block that matches today's date)
     now = datetime.now().date()
@@ -965,22 +1572,13 @@ def manage_prerolls(config):
     active_block = None
 
     for block in config.get("preroll_blocks", []):
+        # Same (month, day) windows as seasonal blocks, pre-parsed by load_config()
         try:
-            start_month, start_day = map(int, block["start_date"].split("-"))
-            end_month, end_day = map(int, block["end_date"].split("-"))
+            is_active = _seasonal_block_active(block, mmdd)
         except Exception as e:
             logging.error(f"Invalid preroll block dates for block '{block.get('name','Unnamed')}': {e}")
             continue
 
-        start_md = (start_month, start_day)
-        end_md = (end_month, end_day)
-
-        if start_md <= end_md:
-            is_active = (start_md <= mmdd <= end_md)
-        else:
-            # handle wrap-around (e.g., 12-30 to 01-05)
-            is_active = (mmdd >= start_md or mmdd <= end_md)
-
         if is_active:
             active_block = block
             break
@@ -1030,8 +1628,7 @@ def manage_prerolls(config):
 
         # Save the new current_roll_filename
         try:
-            with open(current_roll_path, 'w', encoding='utf-8') as f:
-                f.write(target_filename)
+            _write_file_atomic(current_roll_path, target_filename.encode('utf-8'))
             logging.info(f"Updated current_roll.txt with '{target_filename}'.")
         except Exception as e:
             logging.error(f"Failed to write current_roll.txt: {e}")
@@ -1082,8 +1679,7 @@ def manage_prerolls(config):
 
         # Save the new current_roll_filename as default
         try:
-            with open(current_roll_path, 'w', encoding='utf-8') as f:
-                f.write(default_filename)
+            _write_file_atomic(current_roll_path, default_filename.encode('utf-8'))
             logging.info(f"Updated current_roll.txt with '{default_filename}'.")
         except Exception as e:
             logging.error(f"Failed to write current_roll.txt: {e}")
@@ -1092,6 +1688,10 @@ def manage_prerolls(config):
 
 def main(gui_instance=None, stop_event=None):
     logging.info("Starting DynamiX automation...")
+    pool = None
+    # The loop sleeps on stop_event.wait(), so it always needs an event to wait on
+    if stop_event is None:
+        stop_event = threading.Event()
 
     try:
         config = load_config()
@@ -1112,20 +1712,26 @@ def main(gui_instance=None, stop_event=None):
         pinned_collections = config.get("pinned_collections", [])
 
         used_collections = load_used_collections()
-        user_exemptions = load_user_exemptions()
+
+        # One pool for the lifetime of the loop; library work is Plex I/O bound
+        pool = ThreadPoolExecutor(max_workers=library_worker_count(libraries, config))
 
         logging.info("Entering main automation loop.")
 
         while not stop_event.is_set():
+            # Marked "running" now; re-read before the end-of-cycle save below
             run_state = load_run_state()
             run_state["state"] = "running"
             save_run_state(run_state)
+            # One timestamp per cycle, shared by every library's time/season checks
+            cycle_now = datetime.now()
+
             # 1) Clean up expired exclusions
-            current_date = datetime.now().date()
+            today_ord = cycle_now.date().toordinal()
             used_collections = {
-                name: date
-                for name, date in used_collections.items()
-                if datetime.strptime(date, '%Y-%m-%d').date() > current_date
+                name: expires
+                for name, expires in used_collections.items()
+                if expires > today_ord
             }
             save_used_collections(used_collections)
             if stop_event.is_set():
@@ -1136,88 +1742,59 @@ def main(gui_instance=None, stop_event=None):
             if stop_event.is_set():
                 break
 
-            all_recently_pinned = []
+            all_recently_pinned = set()
+            # Re-read each cycle so exemptions edited in the web UI apply without a restart;
+            # the file is only parsed again when it changed. Workers only test membership.
+            exempt_set = frozenset(load_user_exemptions())
+            seasonal_today = active_seasonal_blocks(seasonal_blocks, cycle_now.date())
+            lib_map = fetch_library_collections(plex, libraries, pool)
+
+            def run_phase(targets):
+                run_per_library(pool, libraries, lambda lib: process_library(
+                    plex, lib, config,
+                    used_collections, exempt_set,
+                    targets, always_pin_new_episodes,
+                    seasonal_today, pinned_collections,
+                    exclusion_days, all_recently_pinned,
+                    lib_map.get(lib), cycle_now
+                ), stop_event)
+
             if not separate_pinning:
                 # ── old single pass ──
-                threads = []
-                for lib in libraries:
-                    if stop_event.is_set(): break
-                    t = threading.Thread(
-                        target=process_library,
-                        args=(
-                            plex, lib, config,
-                            used_collections, user_exemptions,
-                            pinning_targets, always_pin_new_episodes,
-                            seasonal_blocks, pinned_collections,
-                            exclusion_days, all_recently_pinned
-                        ),
-                        daemon=True
-                    )
-                    t.start()
-                    threads.append(t)
-                for t in threads: t.join()
+                run_phase(pinning_targets)
 
             else:
                 # ── Phase 1: library‐recommended only ──
-                lib_targets = {
+                run_phase({
                     "library_recommended": pinning_targets.get("library_recommended", False),
                     "home": False,
                     "shared_home": False
-                }
-                threads = []
-                for lib in libraries:
-                    if stop_event.is_set(): break
-                    t = threading.Thread(
-                        target=process_library,
-                        args=(
-                            plex, lib, config,
-                            used_collections, user_exemptions,
-                            lib_targets, always_pin_new_episodes,
-                            seasonal_blocks, pinned_collections,
-                            exclusion_days, all_recently_pinned
-                        ),
-                        daemon=True
-                    )
-                    t.start()
-                    threads.append(t)
-                for t in threads: t.join()
+                })
 
                 # ── Phase 2: home/shared‐home only ──
-                home_targets = {
+                run_phase({
                     "library_recommended": False,
                     "home": pinning_targets.get("home", False),
                     "shared_home": pinning_targets.get("shared_home", False)
-                }
-                threads = []
-                for lib in libraries:
-                    if stop_event.is_set(): break
-                    t = threading.Thread(
-                        target=process_library,
-                        args=(
-                            plex, lib, config,
-                            used_collections, user_exemptions,
-                            home_targets, always_pin_new_episodes,
-                            seasonal_blocks, pinned_collections,
-                            exclusion_days, all_recently_pinned
-                        ),
-                        daemon=True
-                    )
-                    t.start()
-                    threads.append(t)
-                for t in threads: t.join()
+                })
+
+            # One exclusion-list write for the whole cycle, after every library finished
+            save_used_collections(used_collections)
 
             # 6) GUI callback
             if gui_instance and not stop_event.is_set():
                 gui_instance.after(0, gui_instance.refresh_exemptions_and_exclusions)
 
-            # Track run timing
+            # Track run timing. Re-read first so changes made during the cycle
+            # (a run-once, /stop) aren't overwritten; the file is only parsed if it changed.
             run_state = load_run_state()
             now = datetime.now()
             run_state["last_run"] = now.strftime("%Y-%m-%d %H:%M:%S")
             run_state["next_run"] = (now + timedelta(seconds=pinning_interval)).strftime("%Y-%m-%d %H:%M:%S")
             run_state["pinned_today"] = run_state.get("pinned_today", 0) + len(all_recently_pinned)
-            run_state["recently_pinned"] = sorted(set(all_recently_pinned))
-            run_state["state"] = "waiting"
+            run_state["recently_pinned"] = sorted(all_recently_pinned)
+            # /stop no longer waits for the cycle, so don't overwrite its “stopped”
+            run_state["state"] = "stopped" if stop_event.is_set() else "waiting"
             save_run_state(run_state)
 
             logging.info(f"Waiting up to {pinning_interval // 60} minutes or until stopped.")
@@ -1230,6 +1807,8 @@ def main(gui_instance=None, stop_event=None):
         logging.error(f"An error occurred: {e}")
         traceback.print_exc()
     finally:
+        if pool is not None:
+            pool.shutdown(wait=False)
         logging.info("Automation script terminated.")
 
 # ------------------------------ Web UI Section ------------------------------
@@ -1237,44 +1816,69 @@ def main(gui_instance=None, stop_event=None):
 app = Flask(__name__)
 
 automation_thread = None
+one_off_thread = None
 stop_event = threading.Event()
 
+# How long /start waits for a stopped loop to finish its current cycle (seconds)
+STOP_JOIN_TIMEOUT = 10
+
+def automation_stopping():
+    """True while a stopped loop is still finishing its current cycle."""
+    return bool(automation_thread and automation_thread.is_alive() and stop_event.is_set())
+
+# Short-lived caches of Plex listings for the web pages, keyed by
+# (plex_url, plex_token, libraries) -> (monotonic time, value)
+PLEX_CACHE_TTL = 60
+_COLLECTION_COUNT_CACHE = {}
+_COLLECTION_TITLES_CACHE = {}
+
+def total_collections_count(cfg):
+    """
+    Total number of collections across the configured libraries, or "—" if Plex
+    can't be reached. The dashboard polls this every few seconds, so the result is
+    reused for PLEX_CACHE_TTL seconds per server/token/library set.
+    """
+    key = (cfg.get("plex_url"), cfg.get("plex_token"), tuple(cfg.get("libraries", [])))
+    cached = _COLLECTION_COUNT_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < PLEX_CACHE_TTL:
+        return cached[1]
+    try:
+        plex = connect_to_plex(cfg)
+        total = sum(len(get_library_section(plex, lib).collections())
+                    for lib in cfg.get("libraries", []))
+    except Exception:
+        return "—"
+    _COLLECTION_COUNT_CACHE.clear()
+    _COLLECTION_COUNT_CACHE[key] = (time.monotonic(), total)
+    return total
+
 @app.route("/dashboard_data")
 def dashboard_data():
-    cfg    = load_config()
+    # Every input below is served from an mtime-keyed cache; the config is only read
+    cfg    = load_config_readonly()
     used   = load_used_collections()
     ex     = load_user_exemptions()
     run_st = load_run_state()
 
     # 1) Compute total collections
-    try:
-        plex = connect_to_plex(cfg)
-        total = sum(len(plex.library.section(lib).collections())
-                    for lib in cfg.get("libraries", []))
-    except Exception:
-        total = "—"
+    total = total_collections_count(cfg)
 
     # 2) Build summaries
     libs = cfg.get("libraries", [])
+    now = datetime.now()
     active = []
     for lib in libs:
-        name, limit = get_current_time_block(cfg, lib)
+        name, limit = get_current_time_block(cfg, lib, now)
         active.append(f"{lib}: {name} ({limit})")
     seasonal = []
+    seasonal_today = active_seasonal_blocks(cfg.get("seasonal_blocks", []), now.date())
     for lib in libs:
-        for item in pin_seasonal_blocks_for_library(lib, cfg.get("seasonal_blocks", [])):
+        for item in pin_seasonal_blocks_for_library(lib, seasonal_today, now.date()):
             seasonal.append(f"{lib}: {item['title']}")
 
     # 3) Read the real current pre-roll filename
     folder = cfg.get("pre_roll_folder", "")
-    current_roll = ""
-    current_path = os.path.join(folder, CURRENT_ROLL_FILE)
-    if os.path.exists(current_path):
-        try:
-            with open(current_path, 'r', encoding='utf-8') as f:
-                current_roll = f.read().strip()
-        except Exception:
-            current_roll = ""
+    current_roll = read_current_roll(folder)
 
     # 4) Return everything in one JSON
     return jsonify({
@@ -1308,7 +1912,8 @@ def service_worker():
 
 @app.before_request
 def require_basic_auth():
-    cfg = load_config()
+    # Runs before every request (including the logs/status polls), so skip the copy
+    cfg = load_config_readonly()
     # Skip auth when disabled or for static assets
     if not cfg.get("auth_enabled", False) or request.endpoint == 'static':
         return
@@ -1337,36 +1942,24 @@ def index():
     # Build active time-block & seasonal summaries
     active_blocks = []
     seasonal_summary = []
+    now = datetime.now()
+    seasonal_today = active_seasonal_blocks(seasonal_blocks, now.date())
     for lib in libraries:
         try:
-            block_name, limit = get_current_time_block(config, lib)
+            block_name, limit = get_current_time_block(config, lib, now)
             active_blocks.append(f"{lib}: {block_name} ({limit})")
-            for item in pin_seasonal_blocks_for_library(lib, seasonal_blocks):
+            for item in pin_seasonal_blocks_for_library(lib, seasonal_today, now.date()):
                 seasonal_summary.append(f"{lib}: {item['title']}")
         except Exception as e:
             logging.warning(f"Error computing blocks for '{lib}': {e}")
 
-    # Compute total collections
-    try:
-        plex = connect_to_plex(config)
-        total_collections_count = sum(
-            len(plex.library.section(lib).collections())
-            for lib in libraries
-        )
-    except Exception as e:
-        logging.error(f"Error connecting to Plex in index(): {e}")
-        total_collections_count = "—"
+    # The collection total needs a Plex round-trip per library, so the page is
+    # rendered without it and app.js fills it in from /dashboard_data on load.
+    total_collections_count = "…"
 
     # Read current active pre-roll filename
-    current_roll_filename = ""
     folder = config.get("pre_roll_folder", "")
-    path = os.path.join(folder, CURRENT_ROLL_FILE)
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                current_roll_filename = f.read().strip()
-        except Exception as e:
-            logging.warning(f"Could not read current_roll.txt: {e}")
+    current_roll_filename = read_current_roll(folder)
 
     # Determine initial badge state:
     #  - if persisted state is "one-off", show that
@@ -1375,6 +1968,8 @@ def index():
     persisted = run_state.get("state", "stopped")
     if persisted == "one-off":
         display_state = "one-off"
+    elif automation_stopping():
+        display_state = "stopping"
     elif automation_thread and automation_thread.is_alive():
         display_state = persisted
     else:
@@ -1389,6 +1984,9 @@ def index():
     elif display_state == "waiting":
         initial_state = "Waiting"
         initial_badge_class = "badge bg-info"
+    elif display_state == "stopping":
+        initial_state = "Stopping…"
+        initial_badge_class = "badge bg-warning"
     else:
         initial_state = "Stopped"
         initial_badge_class = "badge bg-secondary"
@@ -1425,6 +2023,9 @@ def web_run_state():
         state["state"] = "stopped"
         save_run_state(state)
         rs = "stopped"
+    elif rs != "one-off" and automation_stopping():
+        # Stop was requested but the loop is still finishing its cycle
+        rs = "stopping"
 
     return jsonify({
         "last_run": state.get("last_run", "—"),
@@ -1441,7 +2042,8 @@ def clear_pins():
         libraries = config.get("libraries", [])
         pinning_targets = config.get("pinning_targets", {})
         always_pin_new_episodes = config.get("always_pin_new_episodes", False)
-        unpin_collections(plex, libraries, always_pin_new_episodes, pinning_targets)
+        lib_map = fetch_library_collections(plex, libraries)
+        unpin_collections(lib_map, always_pin_new_episodes, pinning_targets)
         return jsonify(status="success")
     except Exception as e:
         logging.error(f"Clear pins failed: {e}")
@@ -1450,9 +2052,15 @@ def clear_pins():
 @app.route("/start", methods=["POST"])
 def web_start():
     global automation_thread, stop_event
+    if automation_stopping():
+        # A stopped loop is still finishing its cycle; give it a moment so we don't
+        # answer "already running" for a loop that is about to exit
+        automation_thread.join(STOP_JOIN_TIMEOUT)
+        if automation_thread.is_alive():
+            return jsonify(status="stopping")
     if not automation_thread or not automation_thread.is_alive():
-        # Start the loop
-        stop_event.clear()
+        # Start the loop with its own stop event
+        stop_event = threading.Event()
         automation_thread = threading.Thread(target=main, args=(None, stop_event), daemon=True)
         automation_thread.start()
 
@@ -1468,8 +2076,9 @@ def web_start():
 def web_stop():
     global automation_thread, stop_event
     if automation_thread and automation_thread.is_alive():
+        # Signal the loop and return; it exits at its next stop_event check
+        # instead of holding this request open while a cycle finishes.
         stop_event.set()
-        automation_thread.join(timeout=10)
         # Persist “stopped” immediately
         state = load_run_state()
         state["state"] = "stopped"
@@ -1477,23 +2086,38 @@ def web_stop():
         return jsonify(status="stopped")
     return jsonify(status="not running")
 
-@app.route("/run-once", methods=["POST"])
-def web_run_once():
+def _run_one_off_cycle():
+    """
+    Body of the background one-off run started by /run-once.
+    """
     try:
-        # 1) Mark “one-off” in run_state so the badge updates immediately
+        run_pin_cycle_once()
+    except Exception as e:
+        logging.error(f"Run-once failed: {e}")
+    finally:
+        # When complete, always mark as stopped (no auto-restarts)
         state = load_run_state()
-        state["state"] = "one-off"
+        state["state"] = "stopped"
         save_run_state(state)
 
-        # 2) Execute exactly one pinning cycle
-        pinned = run_pin_cycle_once()
-
-        # 3) When complete, always mark as stopped (no auto-restarts)
+@app.route("/run-once", methods=["POST"])
+def web_run_once():
+    """
+    Start a single pinning cycle in the background. The dashboard follows its
+    progress through /run_state, which reports "one-off" until it finishes.
+    """
+    global one_off_thread
+    if one_off_thread and one_off_thread.is_alive():
+        return jsonify(status="already running")
+    try:
+        # Mark “one-off” in run_state so the badge updates immediately
         state = load_run_state()
-        state["state"] = "stopped"
+        state["state"] = "one-off"
         save_run_state(state)
 
-        return jsonify(status="success", pinned=pinned)
+        one_off_thread = threading.Thread(target=_run_one_off_cycle, daemon=True)
+        one_off_thread.start()
+        return jsonify(status="started")
     except Exception as e:
         logging.error(f"Run-once failed: {e}")
         return jsonify(status="error", message=str(e)), 500
@@ -1515,140 +2139,60 @@ def pinned_data():
 # ————————————————
 @app.route("/settings", methods=["GET", "POST"])
 def web_settings():
-    from dynamiXMain import load_config, save_config, connect_to_plex
     cfg = load_config()
     if request.method == "POST":
         # General
         cfg['plex_url']  = request.form['plex_url']
         cfg['plex_token']= request.form['plex_token']
         cfg['libraries']= [l.strip() for l in request.form['libraries'].split(',') if l.strip()]
-        cfg['pinning_interval']    = int(request.form.get('pinning_interval', '30') or '30')
-        cfg['exclusion_days']      = int(request.form.get('exclusion_days', '3') or '3')
-        cfg['minimum_items']       = int(request.form.get('minimum_items', '1') or '1')
-        cfg['always_pin_new_episodes'] = ('always_pin' in request.form)
-        cfg['pre_roll_folder'] = request.form.get('pre_roll_folder', '').strip()
-        cfg['auth_enabled'] = ('auth_enabled' in request.form)
-        cfg['auth_username'] = request.form.get('auth_username', '').strip()
-        cfg['auth_password'] = request.form.get('auth_password', '')
+        form = request.form
+        cfg.update({key: int(form.get(key) or default) for key, default in SETTINGS_INT_FIELDS})
+        cfg.update({key: field in form for field, key in SETTINGS_CHECKBOXES})
+        cfg['pre_roll_folder'] = form.get('pre_roll_folder', '').strip()
+        cfg['auth_username'] = form.get('auth_username', '').strip()
+        cfg['auth_password'] = form.get('auth_password', '')
 
         # Pinning targets
-        cfg.setdefault('pinning_targets', {})
-        cfg['pinning_targets']['library_recommended'] = ('pt_library' in request.form)
-        cfg['pinning_targets']['home']               = ('pt_home' in request.form)
-        cfg['pinning_targets']['shared_home']        = ('pt_shared' in request.form)
-        # Separate pinning setting
-        cfg['separate_pinning'] = ('separate_pinning' in request.form)
-
-        # Default limits per library
-        cfg.setdefault('default_limits', {})
-        for lib in cfg['libraries']:
-            key = f"limit_{lib}"
-            if key in request.form:
-                value = request.form[key].strip()
-                cfg['default_limits'][lib] = int(value) if value else 5
+        cfg.setdefault('pinning_targets', {}).update(
+            {key: field in form for field, key in PINNING_TARGET_CHECKBOXES}
+        )
+
+        # Default limits per library (a blank box means 5)
+        cfg.setdefault('default_limits', {}).update({
+            lib: int(value.strip() or 5)
+            for lib in cfg['libraries']
+            if (value := form.get(f"limit_{lib}")) is not None
+        })
 
         save_config(cfg)
         return redirect(url_for('web_settings'))
 
-    import logging
-    # --- GET: fetch collection titles per library for the Seasonal Blocks dropdown ---
-    available_collections_by_lib = {}
-    try:
-        plex = connect_to_plex(cfg)
-        for lib_name in cfg.get("libraries", []):
-            titles = []
-            try:
-                section = plex.library.section(lib_name)
-                for coll in section.collections():
-                    titles.append(coll.title)
-            except Exception as e:
-                logging.error(f"Could not load library '{lib_name}': {e}")
-            available_collections_by_lib[lib_name] = sorted(set(titles))
-    except Exception as e:
-        logging.error(f"Error fetching collections for settings page: {e}")
-
-    # ——— Compute dynamic defaults for this year ———
-    from datetime import datetime
+    # Collection titles for the Seasonal tab are fetched by the page itself from
+    # /settings/library-collections the first time that tab is opened.
 
+    # ——— Dynamic defaults for this year (computed once per year) ———
     year = datetime.now().year
-    computed_defaults = []
-    for d in DEFAULT_SEASONAL_BLOCKS:
-        if d["type"] == HolidayType.STATIC:
-            m1, day1 = map(int, d["start"].split("-"))
-            m2, day2 = map(int, d["end"].split("-"))
-            sd = date(year, m1, day1)
-            ed = date(year, m2, day2)
-        elif d["type"] == HolidayType.EASTER:
-            eas = compute_easter(year)
-            sd = eas + timedelta(days=d.get("offset_start", 0))
-            ed = eas + timedelta(days=d.get("offset_end", 0))
-        else:  # NTH_WEEKDAY
-            sd = find_nth_weekday(year, d["month"], d["weekday"], d["nth"])
-            ed = sd + timedelta(days=d["duration_days"] - 1)
-        computed_defaults.append({
-            "name": d["name"],
-            "start_date": sd.strftime("%Y-%m-%d"),
-            "end_date": ed.strftime("%Y-%m-%d")
-        })
-
-    # after you build computed_defaults…
-    weekly_defaults = [
-        b for b in computed_defaults
-        if b["name"].lower().endswith("week")
-    ]
+    computed_defaults, weekly_defaults = seasonal_defaults(year)
     # ——————— Preroll context for Settings sub-tab ———————
     # 1) Load blocks and files
     blocks = cfg.get("preroll_blocks", [])
     folder = cfg.get("pre_roll_folder", "")
-    if folder and os.path.isdir(folder):
-        files = sorted(os.listdir(folder))
-    else:
-        files = []
-    # Exclude the marker and any already-applied PlexMainPreRoll
-    files = [f for f in files if f != CURRENT_ROLL_FILE and not f.startswith("PlexMainPreRoll")]
+    files = list_preroll_files(folder)
 
     # 2) Read the current active preroll filename
-    current_roll_filename = ""
-    current_roll_path = os.path.join(folder, CURRENT_ROLL_FILE)
-    if os.path.exists(current_roll_path):
-        with open(current_roll_path, 'r', encoding='utf-8') as rf:
-            current_roll_filename = rf.read().strip()
+    current_roll_filename = read_current_roll(folder)
 
     # Ensure the active pre-roll appears as an option
     if current_roll_filename and current_roll_filename not in files:
         files.insert(0, current_roll_filename)
 
     # 3) Build Quick-Add defaults (±3 days around each holiday)
-    year = datetime.now().year
-    quick_defaults = []
-    for d in DEFAULT_SEASONAL_BLOCKS:
-        if d["type"] == HolidayType.STATIC:
-            m1, day1 = map(int, d["start"].split("-"))
-            m2, day2 = map(int, d["end"].split("-"))
-            sd = date(year, m1, day1)
-            ed = date(year, m2, day2)
-        elif d["type"] == HolidayType.EASTER:
-            eas = compute_easter(year)
-            sd = eas + timedelta(days=d.get("offset_start", 0))
-            ed = eas + timedelta(days=d.get("offset_end", 0))
-        else:  # NTH_WEEKDAY
-            sd = find_nth_weekday(year, d["month"], d["weekday"], d["nth"])
-            ed = sd + timedelta(days=d["duration_days"] - 1)
-        # expand single-day blocks ±3 days
-        if sd == ed:
-            sd -= timedelta(days=3)
-            ed += timedelta(days=3)
-        quick_defaults.append({
-            "name":    d["name"],
-            "start_md": sd.strftime("%m-%d"),
-            "end_md":   ed.strftime("%m-%d")
-        })
+    quick_defaults = quick_add_defaults(year)
     # ————————————————————————————————————————————
 
     return render_template(
         "settings.html",
         config=cfg,
-        available_collections_by_lib=available_collections_by_lib,
         default_blocks=computed_defaults,
         weekly_defaults=weekly_defaults,
         # —— new preroll context ——
@@ -1657,9 +2201,54 @@ def web_settings():
         current_roll_filename=current_roll_filename,
         default_preroll_filename=cfg.get("default_preroll_filename", ""),
         quick_defaults=quick_defaults,
+        message=request.args.get("message"),
+        message_type=request.args.get("message_type", "info")
     )
 
 
+def collection_titles_by_library(cfg):
+    """
+    Return {library: sorted collection titles} for every configured library, or
+    None when Plex can't be reached. Listings are reused for PLEX_CACHE_TTL seconds;
+    callers get their own copy.
+    """
+    key = (cfg.get("plex_url"), cfg.get("plex_token"), tuple(cfg.get("libraries", [])))
+    cached = _COLLECTION_TITLES_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < PLEX_CACHE_TTL:
+        return {lib: list(titles) for lib, titles in cached[1].items()}
+
+    libraries = cfg.get("libraries", [])
+    available_collections_by_lib = {}
+    try:
+        plex = connect_to_plex(cfg)
+        # List the libraries concurrently; a miss costs the slowest library, not the sum
+        with ThreadPoolExecutor(max_workers=library_worker_count(libraries, cfg)) as pool:
+            lib_map = fetch_library_collections(plex, libraries, pool)
+    except Exception as e:
+        logging.error(f"Error fetching collections for settings page: {e}")
+        return None
+    for lib_name in libraries:
+        entry = lib_map.get(lib_name)
+        available_collections_by_lib[lib_name] = sorted({c.title for c in entry[1]}) if entry else []
+    if any(lib_name not in lib_map for lib_name in libraries):
+        # fetch_library_collections() already logged the libraries that failed
+        return available_collections_by_lib
+
+    _COLLECTION_TITLES_CACHE.clear()
+    _COLLECTION_TITLES_CACHE[key] = (time.monotonic(), available_collections_by_lib)
+    return {lib: list(titles) for lib, titles in available_collections_by_lib.items()}
+
+@app.route("/settings/library-collections")
+def settings_library_collections():
+    """
+    Collection titles per library for the Seasonal tab's pickers, loaded on demand.
+    """
+    titles = collection_titles_by_library(load_config_readonly())
+    if titles is None:
+        return jsonify(error="Could not reach Plex"), 502
+    return jsonify(titles)
+
+
 @app.route("/kometa-collections", methods=["GET", "POST"])
 def web_kometa_collections():
     import yaml
@@ -1671,17 +2260,14 @@ def web_kometa_collections():
     library_types   = {}
     for lib in libraries:
         try:
-            section = plex.library.section(lib)
+            section = get_library_section(plex, lib)
             library_types[lib] = section.type   # "movie" or "show"
         except Exception:
             library_types[lib] = None
 
     # 2) Build per-library defaults list
     defaults_by_library = {
-        lib: [
-            key for key, types in KOMETA_DEFAULT_TYPES.items()
-            if library_types[lib] in types
-        ]
+        lib: KOMETA_DEFAULTS_BY_TYPE.get(library_types[lib], [])
         for lib in libraries
     }
 
@@ -1732,79 +2318,46 @@ def web_kometa_collections():
         message=message
     )
 
-import re
 @app.route("/settings/seasonal-blocks/suggest-collections")
 def suggest_seasonal_collections():
     holiday = request.args.get('holiday', '').strip()
-    cfg     = load_config()
-    plex    = connect_to_plex(cfg)
+    cfg     = load_config_readonly()
 
-    # pick the list of keywords for this holiday, or fallback to the raw name
-    keywords = HOLIDAY_KEYWORDS.get(holiday, [holiday.lower()])
+    # pick the precompiled keywords for this holiday, or fallback to the raw name
+    pattern = HOLIDAY_PATTERNS.get(holiday) or re.compile(re.escape(holiday), re.IGNORECASE)
 
+    # Reuse the cached per-library titles instead of listing Plex on every click
+    titles_by_lib = collection_titles_by_library(cfg)
+    if titles_by_lib is None:
+        return jsonify(error="Could not reach Plex"), 502
     suggestions = {}
-    for lib in cfg.get('libraries', []):
-        libsugg = []
-        try:
-            section = plex.library.section(lib)
-            for coll in section.collections():
-                title_lower = coll.title.lower()
-                # if ANY of the keywords appears in the title, include it
-                if any(kw in title_lower for kw in keywords):
-                    libsugg.append(coll.title)
-        except Exception as e:
-            logging.error(f"Error fetching collections in '{lib}': {e}")
-        suggestions[lib] = libsugg
+    for lib, titles in titles_by_lib.items():
+        # if ANY of the keywords appears in the title, include it
+        suggestions[lib] = [title for title in titles if pattern.search(title)]
 
     return jsonify(suggestions)
 
-@app.route("/settings/seasonal-blocks/add-defaults",
-           methods=["POST"],
-           endpoint="add_default_seasonal_blocks_defaults")
-def add_default_seasonal_blocks_handler():
-    cfg = load_config()
-    name  = request.form['default_name']
-    start = request.form['sb_start_date']  # "YYYY-MM-DD"
-    end   = request.form['sb_end_date']
-
-    for lib in cfg.get("libraries", []):
-        if f"include_{lib}" not in request.form:
-            continue
-        raw = request.form.get(f"collections_{lib}", "")
-        for coll in [c.strip() for c in raw.split(",") if c.strip()]:
-            cfg.setdefault("seasonal_blocks", []).append({
-                "name":       name,
-                "start_date": start,
-                "end_date":   end,
-                "libraries":  [lib],
-                "collection": coll
-            })
-
-    save_config(cfg)
-    return redirect(url_for("web_settings"))
-
-
 # ————————————————
 # EXCLUSIONS
 # ————————————————
 @app.route("/exclusions", methods=["GET"])
 def web_exclusions():
-    from dynamiXMain import load_used_collections
-    exclusions = load_used_collections()
+    exclusions = {
+        title: date.fromordinal(expires).isoformat()
+        for title, expires in load_used_collections().items()
+    }
     return render_template("exclusions.html", exclusions=exclusions)
 
 @app.route("/exclusions/delete", methods=["POST"])
 def delete_exclusion():
-    from dynamiXMain import load_used_collections, save_used_collections
     title = request.form['title']
     used = load_used_collections()
-    used.pop(title, None)
-    save_used_collections(used)
+    if used.pop(title, None) is not None:
+        save_used_collections(used)
     return redirect(url_for('web_exclusions'))
 
 @app.route("/exclusions/reset", methods=["POST"])
 def reset_exclusions():
-    from dynamiXMain import reset_exclusion_list_file
     reset_exclusion_list_file()
     return redirect(url_for('web_exclusions'))
 
@@ -1814,13 +2367,11 @@ def reset_exclusions():
 # ————————————————
 @app.route("/exemptions", methods=["GET"])
 def web_exemptions():
-    from dynamiXMain import load_user_exemptions
     exemptions = load_user_exemptions()
     return render_template("exemptions.html", exemptions=exemptions)
 
 @app.route("/exemptions/add", methods=["POST"])
 def add_exemption():
-    from dynamiXMain import load_user_exemptions, save_user_exemptions
     title = request.form['exemption'].strip()
     ex = load_user_exemptions()
     if title and title not in ex:
@@ -1830,7 +2381,6 @@ def add_exemption():
 
 @app.route("/exemptions/delete", methods=["POST"])
 def delete_exemption_user():
-    from dynamiXMain import load_user_exemptions, save_user_exemptions
     title = request.form['title']
     ex = load_user_exemptions()
     if title in ex:
@@ -1839,17 +2389,39 @@ def delete_exemption_user():
     return redirect(url_for('web_exemptions'))
 
 
+def tail_lines(path, n, block_size=8192):
+    """
+    Return the last n lines of a text file without reading the whole file.
+    Reads fixed-size blocks backwards from the end until n+1 newlines are seen,
+    then decodes only that slice. A missing file yields an empty list.
+    """
+    if n <= 0:
+        return []
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            chunks = []
+            newlines = 0
+            while pos > 0 and newlines <= n:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+    except OSError:
+        return []
+    data = b"".join(reversed(chunks))
+    return data.decode("utf-8", errors="replace").splitlines()[-n:]
+
 @app.route("/logs")
 def web_logs():
     level = request.args.get("level", "base")
     lines = []
-    try:
-        with open(LOG_FILE) as f:
-            all_lines = f.readlines()[-500:]
-    except:
-        all_lines = []
+    all_lines = tail_lines(LOG_FILE, LOG_VIEW_LINES)
     for line in all_lines:
-        if level == "base" and ("DEBUG" in line or "HTTP/" in line):
+        if level == "base" and _NOISY_LOG_LINE(line):
             continue
         lines.append(line.rstrip())
     return render_template("logs.html", logs=lines, level=level)
@@ -1857,14 +2429,12 @@ def web_logs():
 @app.route("/logs_data")
 def logs_data():
     level = request.args.get("level", "base")
-    try:
-        with open(LOG_FILE) as f:
-            all_lines = f.readlines()
-    except:
-        all_lines = []
+    # Same window as the page itself by default, so the live view doesn't grow without bound
+    limit = request.args.get("limit", LOG_VIEW_LINES, type=int) or LOG_VIEW_LINES
+    all_lines = tail_lines(LOG_FILE, min(max(limit, 1), LOG_DATA_MAX_LINES))
     filtered = []
     for ln in all_lines:
-        if level == "base" and ("DEBUG" in ln or "HTTP/" in ln):
+        if level == "base" and _NOISY_LOG_LINE(ln):
             continue
         filtered.append(ln.rstrip())
     return jsonify(logs=filtered)
@@ -1892,8 +2462,8 @@ def add_preroll_block():
         "end_date":   request.form["end_date"],
         "filename":   request.form["filename"]
     }
-    cfg.setdefault("preroll_blocks", []).append(block)
-    save_config(cfg)
+    if _append_config_entry(cfg, "preroll_blocks", block):
+        save_config(cfg)
     next_url = request.form.get("next")
     return redirect(next_url or url_for("web_preroll"))
 
@@ -1902,8 +2472,10 @@ def add_preroll_block():
 def delete_preroll_block():
     cfg = load_config()
     name = request.form["name"]
-    cfg["preroll_blocks"] = [b for b in cfg.get("preroll_blocks", []) if b["name"] != name]
-    save_config(cfg)
+    blocks = cfg.get("preroll_blocks", [])
+    if any(b["name"] == name for b in blocks):
+        cfg["preroll_blocks"] = [b for b in blocks if b["name"] != name]
+        save_config(cfg)
     next_url = request.form.get("next")
     return redirect(next_url or url_for("web_preroll"))
 
@@ -1915,23 +2487,10 @@ def web_preroll():
 
     # Gather files in pre-roll folder
     folder = config.get("pre_roll_folder", "")
-    if folder and os.path.isdir(folder):
-        files = sorted(os.listdir(folder))
-    else:
-        files = []
-
-    # Exclude internal marker and PlexMainPreRoll
-    files = [f for f in files if f != CURRENT_ROLL_FILE and not f.startswith("PlexMainPreRoll")]
+    files = list_preroll_files(folder)
 
     # Read current active preroll filename
-    current_roll = ""
-    current_roll_path = os.path.join(folder, CURRENT_ROLL_FILE)
-    if os.path.exists(current_roll_path):
-        try:
-            with open(current_roll_path, 'r', encoding='utf-8') as rf:
-                current_roll = rf.read().strip()
-        except Exception:
-            current_roll = ""
+    current_roll = read_current_roll(folder)
 
     # Ensure current_roll and saved default appear in dropdown
     default = config.get("default_preroll_filename", "")
@@ -1940,29 +2499,7 @@ def web_preroll():
             files.insert(0, name)
 
     # Compute quick-add defaults (month-day only, ±3 days wrap)
-    year = datetime.now().year
-    quick = []
-    for d in DEFAULT_SEASONAL_BLOCKS:
-        if d["type"] == HolidayType.STATIC:
-            m1, day1 = map(int, d["start"].split("-"))
-            m2, day2 = map(int, d["end"].split("-"))
-            sd = date(year, m1, day1)
-            ed = date(year, m2, day2)
-        elif d["type"] == HolidayType.EASTER:
-            eas = compute_easter(year)
-            sd = eas + timedelta(days=d.get("offset_start",0))
-            ed = eas + timedelta(days=d.get("offset_end",0))
-        else:
-            sd = find_nth_weekday(year, d["month"], d["weekday"], d["nth"])
-            ed = sd + timedelta(days=d["duration_days"]-1)
-        if sd == ed:
-            sd -= timedelta(days=3)
-            ed += timedelta(days=3)
-        quick.append({
-            "name":    d["name"],
-            "start_md": sd.strftime("%m-%d"),
-            "end_md":   ed.strftime("%m-%d")
-        })
+    quick = quick_add_defaults(datetime.now().year)
 
     return render_template(
         "preroll.html",
@@ -2000,16 +2537,28 @@ def add_time_block():
         "days":        request.form.getlist("tb_days"),
         "libraries":   request.form.getlist("tb_libs")
     }
-    cfg.setdefault("time_blocks", []).append(block)
-    save_config(cfg)
+    try:
+        _time_to_minutes(block["start_time"])
+        _time_to_minutes(block["end_time"])
+    except ValueError as e:
+        logging.error(f"Not adding time block '{block['name']}': {e}")
+        return redirect(url_for(
+            "web_settings",
+            message=f"Time block '{block['name']}' was not added: {e}",
+            message_type="danger"
+        ))
+    if _append_config_entry(cfg, "time_blocks", block):
+        save_config(cfg)
     return redirect(url_for("web_settings"))
 
 @app.route("/settings/time-blocks/delete", methods=["POST"])
 def delete_time_block():
     name = request.form["name"]
     cfg = load_config()
-    cfg["time_blocks"] = [b for b in cfg.get("time_blocks", []) if b["name"] != name]
-    save_config(cfg)
+    blocks = cfg.get("time_blocks", [])
+    if any(b["name"] == name for b in blocks):
+        cfg["time_blocks"] = [b for b in blocks if b["name"] != name]
+        save_config(cfg)
     return redirect(url_for("web_settings"))
 
 
@@ -2025,6 +2574,7 @@ def add_default_seasonal_blocks():
     end_date   = request.form['sb_end_date']
 
     # For each library, if its include-box was checked, split its collections
+    added = False
     for lib in cfg.get("libraries", []):
         if f"include_{lib}" not in request.form:
             continue
@@ -2037,11 +2587,17 @@ def add_default_seasonal_blocks():
                 "libraries":  [lib],
                 "collection": coll
             }
-            cfg.setdefault("seasonal_blocks", []).append(block)
+            added = _append_config_entry(cfg, "seasonal_blocks", block) or added
 
-    save_config(cfg)
+    if added:
+        save_config(cfg)
     return redirect(url_for("web_settings"))
 
+# Older name for the same view, kept so existing url_for() calls keep resolving
+app.add_url_rule("/settings/seasonal-blocks/add-defaults",
+                 endpoint="add_default_seasonal_blocks_defaults",
+                 view_func=add_default_seasonal_blocks, methods=["POST"])
+
 
 @app.route("/settings/seasonal-blocks/add", methods=["POST"])
 def add_seasonal_block():
@@ -2053,19 +2609,22 @@ def add_seasonal_block():
         "libraries":  request.form.getlist("sb_libs"),
         "collection": request.form["sb_collection"]
     }
-    cfg.setdefault("seasonal_blocks", []).append(block)
-    save_config(cfg)
+    if _append_config_entry(cfg, "seasonal_blocks", block):
+        save_config(cfg)
     return redirect(url_for("web_settings"))
 
 @app.route("/settings/seasonal-blocks/delete", methods=["POST"])
 def delete_seasonal_block():
     name = request.form["name"]
     cfg = load_config()
-    cfg["seasonal_blocks"] = [
-        b for b in cfg.get("seasonal_blocks", [])
+    blocks = cfg.get("seasonal_blocks", [])
+    kept = [
+        b for b in blocks
         if b["name"] != name or b.get("library_specific_id") != request.form.get("id")
     ]
-    save_config(cfg)
+    if len(kept) != len(blocks):
+        cfg["seasonal_blocks"] = kept
+        save_config(cfg)
     return redirect(url_for("web_settings"))
 
 
@@ -2079,16 +2638,18 @@ def add_pinned_collection():
         "title":     request.form["pc_title"],
         "libraries": request.form.getlist("pc_libs")
     }
-    cfg.setdefault("pinned_collections", []).append(pc)
-    save_config(cfg)
+    if _append_config_entry(cfg, "pinned_collections", pc):
+        save_config(cfg)
     return redirect(url_for("web_settings"))
 
 @app.route("/settings/pinned-collections/delete", methods=["POST"])
 def delete_pinned_collection():
     title = request.form["title"]
     cfg = load_config()
-    cfg["pinned_collections"] = [p for p in cfg.get("pinned_collections", []) if p["title"] != title]
-    save_config(cfg)
+    pinned = cfg.get("pinned_collections", [])
+    if any(p["title"] == title for p in pinned):
+        cfg["pinned_collections"] = [p for p in pinned if p["title"] != title]
+        save_config(cfg)
     return redirect(url_for("web_settings"))
 
 
@@ -10,7 +10,13 @@ document.addEventListener("DOMContentLoaded", () => {
   const lastRunEl    = document.getElementById("last-run");
   const nextRunEl    = document.getElementById("next-run");
 
+  // Polls mostly return what is already on screen; only touch the DOM on change
+  function setText(el, text) {
+    if (el && el.textContent !== String(text)) el.textContent = text;
+  }
+
   function refreshStatus() {
+    if (document.hidden) return;
     if (!statusSpinner.classList.contains("d-none")) return;
 
     fetch("/run_state")
@@ -31,6 +37,10 @@ document.addEventListener("DOMContentLoaded", () => {
             statusBadge.textContent = "Waiting";
             statusBadge.className   = "badge bg-info";
             break;
+          case "stopping":
+            statusBadge.textContent = "Stopping…";
+            statusBadge.className   = "badge bg-warning";
+            break;
           default:
             statusBadge.textContent = "Stopped";
             statusBadge.className   = "badge bg-secondary";
@@ -39,26 +49,27 @@ document.addEventListener("DOMContentLoaded", () => {
         // Disable Run-Once button during one-off
         runOnceBtn.disabled = (data.state === "one-off");
 
-        lastRunEl.textContent = data.last_run;
-        nextRunEl.textContent = data.next_run;
+        setText(lastRunEl, data.last_run);
+        setText(nextRunEl, data.next_run);
       })
       .catch(console.error);
   }
 
   function refreshDashboard() {
+    if (document.hidden) return;
     fetch("/dashboard_data")
       .then(r => r.json())
       .then(data => {
-        document.getElementById("total-collections").textContent  = data.total_collections;
-        document.getElementById("pinned-today").textContent       = data.pinned_today;
-        document.getElementById("exclusions-active").textContent  = data.exclusions_active;
-        document.getElementById("exemptions-count").textContent   = data.exemptions_count;
-
-        document.getElementById("active-time-block").textContent   = data.active_time_block.join(", ") || "None";
-        document.getElementById("library-limits").textContent     = data.library_limits.join(", ");
-        document.getElementById("seasonal-blocks").textContent    = data.seasonal_blocks.join(", ") || "None";
-        document.getElementById("pinned-collections").textContent = data.pinned_collections.join(", ") || "None";
-        document.getElementById("current-roll").textContent       = data.current_roll || "None";
+        setText(document.getElementById("total-collections"),  data.total_collections);
+        setText(document.getElementById("pinned-today"),       data.pinned_today);
+        setText(document.getElementById("exclusions-active"),  data.exclusions_active);
+        setText(document.getElementById("exemptions-count"),   data.exemptions_count);
+
+        setText(document.getElementById("active-time-block"),  data.active_time_block.join(", ") || "None");
+        setText(document.getElementById("library-limits"),     data.library_limits.join(", "));
+        setText(document.getElementById("seasonal-blocks"),    data.seasonal_blocks.join(", ") || "None");
+        setText(document.getElementById("pinned-collections"), data.pinned_collections.join(", ") || "None");
+        setText(document.getElementById("current-roll"),       data.current_roll || "None");
       })
       .catch(console.error);
   }
@@ -116,6 +127,13 @@ document.addEventListener("DOMContentLoaded", () => {
   setInterval(refreshStatus, 5000);
   setInterval(refreshDashboard, 10000);
 
+  // Polls are skipped while the tab is hidden; catch up as soon as it is shown again
+  document.addEventListener("visibilitychange", () => {
+    if (document.hidden) return;
+    refreshStatus();
+    refreshDashboard();
+  });
+
   // Check for update banner
   checkForUpdate();
 });
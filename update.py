@@ -2,24 +2,55 @@
 
 import requests
 import os
+import re
+import time
 import logging
+from functools import lru_cache
 
 # ——————————— Configuration ———————————
 GITHUB_API_LATEST = "https://api.github.com/repos/TheImaginear/dynamix/releases/latest"
 BASE_DIR          = os.path.dirname(os.path.abspath(__file__))
 VERSION_FILE      = os.path.join(BASE_DIR, "VERSION")
 
+# Shared keep-alive session so repeat release lookups reuse the TLS connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2))
+_SESSION.headers["Accept"] = "application/vnd.github+json"
+
+# ETag and parsed result of the last successful release lookup
+_release_cache = {"etag": None, "info": None}
+
+# How long a successful is_update_available() answer is reused (seconds)
+UPDATE_CHECK_TTL = 3600
+_update_check_cache = {"checked_at": None, "result": None}
+
+# Local version tag; only changes when write_current_version() runs
+_current_version_cache = {"loaded": False, "value": None}
+
+# Release tag: optional 'v', dotted numbers, optional pre-release suffix ('-rc1', 'b2')
+_VERSION_RE = re.compile(r"^[vV]?(\d+(?:\.\d+)*)(.*)$")
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 def get_latest_release_info():
     """
     Fetch the latest release metadata from GitHub.
     Returns (tag_name, zipball_url, html_url).
+    Repeat lookups send the previous ETag; a 304 reuses the cached result
+    (and doesn't count against GitHub's rate limit).
     """
-    resp = requests.get(GITHUB_API_LATEST, timeout=10)
+    headers = {}
+    if _release_cache["etag"] and _release_cache["info"]:
+        headers["If-None-Match"] = _release_cache["etag"]
+    resp = _SESSION.get(GITHUB_API_LATEST, headers=headers, timeout=10)
+    if resp.status_code == 304:
+        return _release_cache["info"]
     resp.raise_for_status()
     data = resp.json()
-    return data["tag_name"], data["zipball_url"], data["html_url"]
+    info = (data["tag_name"], data["zipball_url"], data["html_url"])
+    _release_cache["etag"] = resp.headers.get("ETag")
+    _release_cache["info"] = info
+    return info
 
 def read_current_version():
     """Read the locally stored version tag from VERSION_FILE."""
@@ -29,49 +60,76 @@ def read_current_version():
     except FileNotFoundError:
         return None
 
+def get_current_version():
+    """Return the local version tag, reading VERSION_FILE only the first time."""
+    if not _current_version_cache["loaded"]:
+        _current_version_cache["value"] = read_current_version()
+        _current_version_cache["loaded"] = True
+    return _current_version_cache["value"]
+
+def _reset_update_check():
+    """Forget the cached is_update_available() answer so the next call checks again."""
+    _update_check_cache["checked_at"] = None
+    _update_check_cache["result"] = None
+
 def write_current_version(tag):
     """Persist the new version tag to VERSION_FILE."""
     try:
         with open(VERSION_FILE, "w", encoding="utf-8") as f:
             f.write(tag)
+        _current_version_cache["loaded"] = False
+        _reset_update_check()
         logging.info(f"Wrote new version {tag} to {VERSION_FILE}")
     except Exception as e:
         logging.error(f"Failed to write VERSION_FILE: {e}")
 
+@lru_cache(maxsize=32)
 def _version_tuple(v):
     """
-    Turn 'v1.2.0' or '1.9.9' into (1,2,0) or (1,9,9) for comparison.
+    Turn 'v1.2.0' or '1.9.9' into a sortable key for comparison.
+    Trailing zeros are ignored (1.2 == 1.2.0) and a pre-release such as
+    'v1.2.0-rc1' sorts before the final 'v1.2.0'. Unparseable tags give ().
     """
-    v = v.lstrip("v")
-    parts = v.split(".")
-    try:
-        return tuple(int(p) for p in parts)
-    except ValueError:
+    m = _VERSION_RE.match(v.strip())
+    if not m:
         return ()
+    release = tuple(int(p) for p in m.group(1).split("."))
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+    pre = m.group(2).lstrip("-.")
+    return (release, 0, pre) if pre else (release, 1, "")
 
 def is_update_available():
     """
     Return (bool available, str latest_tag, str html_url).
     Only True if latest_tag > current_version.
+    A successful answer is reused for UPDATE_CHECK_TTL seconds; failures are retried.
     """
+    checked_at = _update_check_cache["checked_at"]
+    if checked_at is not None and time.monotonic() - checked_at < UPDATE_CHECK_TTL:
+        return _update_check_cache["result"]
     try:
         latest_tag, _, html_url = get_latest_release_info()
-        current = read_current_version()
+        current = get_current_version()
         if not current:
-            return True, latest_tag, html_url
-
-        if _version_tuple(latest_tag) > _version_tuple(current):
-            return True, latest_tag, html_url
+            result = (True, latest_tag, html_url)
+        elif _version_tuple(latest_tag) > _version_tuple(current):
+            result = (True, latest_tag, html_url)
         else:
-            return False, latest_tag, html_url
+            result = (False, latest_tag, html_url)
+
+        _update_check_cache["checked_at"] = time.monotonic()
+        _update_check_cache["result"] = result
+        return result
 
     except Exception as e:
         logging.error(f"Update check failed: {e}")
-        return False, read_current_version() or "", None
+        return False, get_current_version() or "", None
 
 def perform_update():
     """
     Stubbed out—auto-update is disabled.
     """
     logging.info("Auto-update is disabled; skipping perform_update().")
+    _reset_update_check()
     return False, read_current_version()